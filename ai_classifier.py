@@ -22,6 +22,7 @@ from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_expo
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(BASE_DIR / ".env")
 
+import scrape_metrics
 from logging_config import get_logger, logging_context
 from observability import trace_external_call
 
@@ -357,6 +358,7 @@ def _call_openai(
                     }
                     if text_param:
                         kwargs["text"] = text_param
+                    scrape_metrics.increment("llm_calls")
                     response = openai_client.responses.create(**kwargs)
                     if span and getattr(response, "usage", None):
                         usage = response.usage
@@ -387,6 +389,7 @@ def classify_candidates(candidates: Iterable[dict[str, str]]) -> dict[str, bool]
     - text: description
     """
     candidates = list(candidates)
+    scrape_metrics.increment("candidates_classified", len(candidates))
     results: dict[str, bool] = {}
     pending: list[dict[str, str]] = []
 
@@ -414,6 +417,7 @@ def classify_candidates(candidates: Iterable[dict[str, str]]) -> dict[str, bool]
                         "outcome": cached,
                     },
                 )
+                scrape_metrics.increment("cache_hits")
                 results[cid] = cached
             else:
                 candidate["_cache_key"] = key
@@ -593,6 +597,7 @@ def get_devtools_category(text: str, name: str = "") -> str | None:
     key = _cache_key(name, text)
     cached = _cache_get(_category_cache, key)
     if cached is not None:
+        scrape_metrics.increment("cache_hits")
         return cached
 
     prompt = _get_prompt("devtools-category-classifier", _CATEGORY_CLASSIFIER_FALLBACK)
@@ -1,33 +1,60 @@
 """Flask web application serving the DevTools Scrape frontend and JSON API."""
 
+import csv
+import io
 import os
 import secrets
 import time
 import uuid
-from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict, Optional
+from urllib.parse import urlencode
 
 from dotenv import load_dotenv
-from flask import Flask, render_template, request, jsonify, g
+from flask import Flask, Response, render_template, request, jsonify, g
 
 from database import (
+    API_FIELDS,
+    DATA_DIR,
+    EXPORT_COLUMNS,
+    LISTING_SORTS,
+    SECONDS_PER_DAY,
     SOURCE_REGISTRY,
+    TREND_DIMENSIONS,
+    TREND_GRANULARITIES,
+    bucket_start,
     classify_source,
+)
+from storage import (
     count_all_startups,
     count_search_results,
     count_startups_by_source_key,
     get_all_startups,
+    get_change_generation,
+    get_changes_since,
+    get_generation_changed_at,
     get_last_scrape_time,
     get_related_startups,
+    get_scrape_runs,
     get_source_counts,
     get_startup_by_id,
+    get_startups_by_ids,
     get_startups_by_source_key,
+    get_trends,
     init_db,
+    iter_startups,
     search_startups,
+    shared_connection,
 )
+from chat_jobs import ChatJobs, QueueFull
 from chatbot import generate_chat_response
+from compression import compress_response
 from logging_config import bind_context, get_logger, unbind_context
+from rate_limit import TokenBucketLimiter
+from response_cache import ResponseCache, SharedCache
+from serialization import FastJSONProvider, iter_ndjson
 from observability import (
     generate_trace_id_w3c,
     install_custom_trace_id_filter,
@@ -38,6 +65,8 @@ from observability import (
 load_dotenv()
 
 app = Flask(__name__)
+# jsonify() encodes with orjson when it is installed (see serialization)
+app.json = FastJSONProvider(app)
 logger = get_logger("devtools.app")
 
 # Initialize database
@@ -87,6 +116,116 @@ def _safe_int(value, default: int) -> int:
         return default
 
 
+# Pages and API payloads only change with the data, so hot URLs are served from
+# memory until the change generation moves, and revalidating clients get a 304
+# without a render (see response_cache).
+response_cache: Optional[ResponseCache] = None
+if _truthy_env("DEVTOOLS_RESPONSE_CACHE", default=True):
+    # Shared by every gunicorn worker on the host and survives worker recycling
+    shared_cache: Optional[SharedCache] = None
+    if _truthy_env("DEVTOOLS_SHARED_CACHE", default=True):
+        try:
+            shared_cache = SharedCache(
+                Path(os.getenv("DEVTOOLS_SHARED_CACHE_PATH") or DATA_DIR / "response_cache.db"),
+                ttl_seconds=_safe_float_env("DEVTOOLS_SHARED_CACHE_TTL_SECONDS", 3600.0),
+                max_entries=_safe_int(os.getenv("DEVTOOLS_SHARED_CACHE_SIZE"), 5000),
+            )
+        except Exception:
+            logger.exception("response_cache.shared_unavailable", extra={"event": "response_cache.shared_unavailable"})
+    response_cache = ResponseCache(
+        generation=lambda: get_change_generation(),
+        last_modified=lambda: get_generation_changed_at(),
+        max_entries=_safe_int(os.getenv("DEVTOOLS_RESPONSE_CACHE_SIZE"), 512),
+        refresh_seconds=_safe_float_env("DEVTOOLS_RESPONSE_CACHE_REFRESH_SECONDS", 2.0),
+        shared=shared_cache,
+    )
+
+
+# Cache-Control per route family. Scrapes run on a schedule, so browsers and
+# CDNs may reuse listings briefly and revalidate cheaply with the ETag; the
+# change feed is polled for freshness and must always revalidate.
+CACHE_CONTROL = {
+    "page": "public, max-age=60, stale-while-revalidate=300",
+    "detail": "public, max-age=300, stale-while-revalidate=3600",
+    "search": "public, max-age=60",
+    "api": "public, max-age=30",
+    "feed": "no-cache",
+}
+
+
+def _cached(policy: str):
+    """Apply the response cache and ``CACHE_CONTROL[policy]`` to a view when the cache is enabled."""
+    def decorator(view):
+        if response_cache is None:
+            return view
+        return response_cache.cached(CACHE_CONTROL[policy])(view)
+    return decorator
+
+
+# Per-client rate limits. Buckets live in a small SQLite file shared by every
+# gunicorn worker on the host, so the limit holds per host rather than per
+# worker, and memory stays bounded however many clients show up (see rate_limit).
+def _client_key() -> str:
+    """The client address as seen by the outermost trusted proxy.
+
+    ProxyFix has already replaced ``remote_addr`` with that hop of
+    X-Forwarded-For; anything a client prepends to the header is ignored, so
+    rotating it neither dodges a limit nor evicts other clients' buckets.
+    """
+    return request.remote_addr or "unknown"
+
+
+def _rate_limiter(name: str, per_minute: int) -> TokenBucketLimiter:
+    """Token bucket allowing ``per_minute`` requests per client, shared by this host's workers."""
+    path = None
+    if _truthy_env("DEVTOOLS_RATE_LIMIT_SHARED", default=True):
+        path = Path(os.getenv("DEVTOOLS_RATE_LIMIT_PATH") or DATA_DIR / "rate_limits.db")
+    try:
+        return TokenBucketLimiter(
+            capacity=per_minute,
+            rate=per_minute / 60.0,
+            max_keys=_safe_int(os.getenv("DEVTOOLS_RATE_LIMIT_MAX_KEYS"), 10_000),
+            path=path,
+            name=name,
+        )
+    except Exception:
+        logger.exception("rate_limit.shared_unavailable", extra={"event": "rate_limit.shared_unavailable"})
+        return TokenBucketLimiter(capacity=per_minute, rate=per_minute / 60.0, name=name)
+
+
+def _chat_rate_limited(client_ip: str):
+    logger.warning(
+        "api.chat.rate_limited",
+        extra={"event": "api.chat.rate_limited", "client_ip": client_ip},
+    )
+    return jsonify({
+        'error': 'Rate limit exceeded',
+        'response': 'You are sending messages too quickly. Please wait a moment and try again.',
+        'tools': [],
+    }), 429
+
+
+def _search_rate_limited(client_ip: str):
+    logger.warning(
+        "api.search.rate_limited",
+        extra={"event": "api.search.rate_limited", "client_ip": client_ip},
+    )
+    return jsonify({"error": "Rate limit exceeded"}), 429
+
+
+chat_limiter = _rate_limiter("chat", _safe_int(os.getenv("CHATBOT_RATE_LIMIT"), 10))
+# The search API is open by default; set a per-minute budget to protect the FTS index
+_SEARCH_RATE_LIMIT = _safe_int(os.getenv("DEVTOOLS_SEARCH_RATE_LIMIT"), 0)
+search_limiter = _rate_limiter("search", _SEARCH_RATE_LIMIT) if _SEARCH_RATE_LIMIT > 0 else None
+
+
+def _search_limited(view):
+    """Apply ``search_limiter`` to a view when a search rate limit is configured."""
+    if search_limiter is None:
+        return view
+    return search_limiter.limit(_client_key, _search_rate_limited)(view)
+
+
 def _rum_script_source(site: str) -> str:
     """Return the Datadog RUM browser agent script URL for the given site."""
     region_map = {
@@ -162,7 +301,10 @@ def inject_datadog_rum() -> Dict[str, Any]:
 
 if not app.debug:
     from werkzeug.middleware.proxy_fix import ProxyFix
-    app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
+    # nginx is the one proxy in front of gunicorn; only its X-Forwarded-For
+    # entry is trusted. Set to 0 when the app is exposed directly.
+    _trusted_proxies = max(0, _safe_int(os.getenv("DEVTOOLS_TRUSTED_PROXIES"), 1))
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=_trusted_proxies, x_proto=1, x_host=1)
 
 def _apply_custom_trace_id():
     """Generate and apply a W3C trace ID to the current root span.
@@ -200,7 +342,7 @@ def _start_request_logging():
     request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
     g.request_id = request_id
     g.request_start_time = time.perf_counter()
-    client_ip = request.headers.get("X-Forwarded-For", request.remote_addr)
+    client_ip = _client_key()
     bind_context(
         request_id=request_id,
         http_method=request.method,
@@ -233,12 +375,17 @@ def _complete_request_logging(response):
             "event": "request.complete",
             "status_code": response.status_code,
             "duration_ms": duration_ms,
-            "content_length": response.calculate_content_length(),
+            # calculate_content_length() buffers streamed bodies into memory
+            "content_length": None if response.is_streamed else response.calculate_content_length(),
         },
     )
     return response
 
 
+# Registered after the logging hook so it runs first and the logged length is on-the-wire
+app.after_request(compress_response)
+
+
 @app.teardown_request
 def _teardown_request_logging(exc):
     if exc is not None:
@@ -254,15 +401,55 @@ def _teardown_request_logging(exc):
         keys_to_unbind.append("custom_trace_id")
     unbind_context(*keys_to_unbind)
 
-def _parse_pagination(default_per_page: int = 20, max_per_page: int = 100):
+# Listing pages per page; static_export.LISTING_PER_PAGE renders the same size
+LISTING_PER_PAGE = 20
+
+
+def _parse_pagination(default_per_page: int = LISTING_PER_PAGE, max_per_page: int = 100, args=None):
     """Parse page and per_page from request args, returning (page, per_page, offset)."""
-    raw_per_page = _safe_int(request.args.get('per_page', default_per_page), default_per_page)
+    args = request.args if args is None else args
+    raw_per_page = _safe_int(args.get('per_page', default_per_page), default_per_page)
     per_page = min(max(raw_per_page, 1), max_per_page)
-    page = max(_safe_int(request.args.get('page', 1), 1), 1)
+    page = max(_safe_int(args.get('page', 1), 1), 1)
     offset = (page - 1) * per_page
     return page, per_page, offset
 
 
+def _parse_sort() -> str:
+    """Return the requested listing order, falling back to newest first."""
+    sort = request.args.get('sort', 'date')
+    return sort if sort in LISTING_SORTS else 'date'
+
+
+def _parse_projection(args=None) -> tuple[Dict[str, Any], Optional[str]]:
+    """Parse ``fields`` and ``desc_len`` into data-layer keyword arguments, or an error message.
+
+    Without ``fields`` every entry of ``API_FIELDS`` is returned, the full
+    ``description`` included, as the API always has; the data layer joins it
+    for the returned page only. Clients that do not need it leave it out with
+    ``?fields=``.
+    """
+    args = request.args if args is None else args
+    projection: Dict[str, Any] = {'fields': API_FIELDS}
+    fields_arg = args.get('fields', '')
+    if fields_arg:
+        fields = tuple(dict.fromkeys(field.strip() for field in fields_arg.split(',') if field.strip()))
+        unknown = sorted(set(fields) - set(API_FIELDS))
+        if unknown or not fields:
+            return {}, f"Invalid 'fields' {unknown}; expected a comma-separated subset of {list(API_FIELDS)}"
+        projection['fields'] = fields
+    desc_len_arg = args.get('desc_len', '')
+    if desc_len_arg:
+        try:
+            desc_len = int(desc_len_arg)
+        except ValueError:
+            desc_len = -1
+        if desc_len < 0:
+            return {}, "Invalid 'desc_len'; expected a non-negative integer"
+        projection['desc_len'] = desc_len
+    return projection, None
+
+
 def _total_pages(total_results: int, per_page: int) -> int:
     """Compute total number of pages, minimum 1."""
     return max((total_results + per_page - 1) // per_page, 1)
@@ -296,18 +483,80 @@ def summarize_sources(startups: list[Dict[str, Any]]) -> Dict[str, int]:
 
     return counts
 
+_SPARKLINE_DAYS = 30
+_TREND_DEFAULT_DAYS = 30
+_TREND_MAX_BUCKETS = 1000
+
+
+def _trend_series(
+    since: int,
+    until: int,
+    granularity: str = "day",
+    by: str = "source",
+    source_key: Optional[str] = None,
+    category: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Expand rollup rows into one count per bucket for every key, zeros included."""
+    step = SECONDS_PER_DAY * (7 if granularity == "week" else 1)
+    buckets = list(range(bucket_start(since, granularity), until, step))
+    positions = {bucket: position for position, bucket in enumerate(buckets)}
+    series: Dict[str, list[int]] = {}
+    totals = [0] * len(buckets)
+    if buckets:
+        for row in get_trends(buckets[0], until, granularity=granularity, by=by, source_key=source_key, category=category):
+            position = positions.get(row["bucket"])
+            if position is None:
+                continue
+            series.setdefault(row["key"], [0] * len(buckets))[position] += row["count"]
+            totals[position] += row["count"]
+    return {
+        "buckets": [_format_epoch_iso_day(bucket // SECONDS_PER_DAY) for bucket in buckets],
+        "series": series,
+        "totals": totals,
+    }
+
+
+def _sparkline_points(values: list[int], width: int = 160, height: int = 32) -> str:
+    """SVG polyline ``points`` for ``values`` scaled into a ``width`` x ``height`` box."""
+    if len(values) < 2:
+        return ""
+    peak = max(values) or 1
+    step = width / (len(values) - 1)
+    return " ".join(
+        f"{index * step:.1f},{height - value / peak * (height - 2) - 1:.1f}"
+        for index, value in enumerate(values)
+    )
+
+
+def _recent_trend(source_key: Optional[str] = None) -> Dict[str, Any]:
+    """Daily totals for the last ``_SPARKLINE_DAYS`` days, shaped for the index sparkline."""
+    until = bucket_start(int(time.time())) + SECONDS_PER_DAY
+    trend = _trend_series(
+        until - _SPARKLINE_DAYS * SECONDS_PER_DAY,
+        until,
+        source_key=source_key if source_key in SOURCE_REGISTRY else None,
+    )
+    return {
+        "days": _SPARKLINE_DAYS,
+        "total": sum(trend["totals"]),
+        "points": _sparkline_points(trend["totals"]),
+    }
+
+
 @app.route('/')
+@_cached("page")
 def index():
     """Main page showing all devtools"""
     source_filter = request.args.get('source', '')
     page, per_page, offset = _parse_pagination()
+    sort = _parse_sort()
 
     if source_filter:
         total_results = count_startups_by_source_key(source_filter)
-        startups = get_startups_by_source_key(source_filter, limit=per_page, offset=offset)
+        startups = get_startups_by_source_key(source_filter, limit=per_page, offset=offset, sort=sort)
     else:
         total_results = count_all_startups()
-        startups = get_all_startups(limit=per_page, offset=offset)
+        startups = get_all_startups(limit=per_page, offset=offset, sort=sort)
 
     paging = _pagination_vars(startups, total_results, page, per_page, offset)
     response = render_template(
@@ -315,7 +564,9 @@ def index():
         startups=startups,
         source_counts=get_source_counts(),
         current_filter=source_filter,
+        sort=sort,
         last_scrape_time=get_last_scrape_time(),
+        trend=_recent_trend(source_filter),
         **paging,
     )
     logger.info(
@@ -323,6 +574,7 @@ def index():
         extra={
             "event": "render.index",
             "source_filter": source_filter or "all",
+            "sort": sort,
             "page": page,
             "per_page": per_page,
             "returned": len(startups),
@@ -332,11 +584,13 @@ def index():
     return response
 
 @app.route('/source/<source_name>')
+@_cached("page")
 def filter_by_source(source_name):
     """Filter tools by source"""
     page, per_page, offset = _parse_pagination()
+    sort = _parse_sort()
 
-    filtered_startups = get_startups_by_source_key(source_name, limit=per_page, offset=offset)
+    filtered_startups = get_startups_by_source_key(source_name, limit=per_page, offset=offset, sort=sort)
     entry = SOURCE_REGISTRY.get(source_name)
     source_display = entry["display"] if entry else "All Sources"
 
@@ -348,7 +602,9 @@ def filter_by_source(source_name):
         source_counts=get_source_counts(),
         current_filter=source_name,
         source_display=source_display,
+        sort=sort,
         last_scrape_time=get_last_scrape_time(),
+        trend=_recent_trend(source_name),
         **paging,
     )
     logger.info(
@@ -356,6 +612,7 @@ def filter_by_source(source_name):
         extra={
             "event": "render.source",
             "source": source_name,
+            "sort": sort,
             "page": page,
             "per_page": per_page,
             "returned": len(filtered_startups),
@@ -365,6 +622,7 @@ def filter_by_source(source_name):
     return response
 
 @app.route('/search')
+@_cached("search")
 def search():
     """Search page"""
     query = request.args.get('q', '')
@@ -399,6 +657,7 @@ def search():
     return response
 
 @app.route('/tool/<int:tool_id>')
+@_cached("detail")
 def tool_detail(tool_id):
     """Show detailed view of a specific tool"""
     tool = get_startup_by_id(tool_id)
@@ -423,105 +682,462 @@ def tool_detail(tool_id):
     )
     return render_template('tool_detail.html', tool=tool, startups=related, last_scrape_time=last_scrape_time)
 
-@app.route('/api/startups')
-def api_startups():
-    """API endpoint for getting all startups"""
-    page, per_page, offset = _parse_pagination(default_per_page=50, max_per_page=200)
-
-    startups = get_all_startups(limit=per_page, offset=offset)
+def _startups_payload(args) -> tuple[Optional[dict], Optional[str]]:
+    """Build the ``/api/startups`` body from query ``args``, or return an error message."""
+    page, per_page, offset = _parse_pagination(default_per_page=50, max_per_page=200, args=args)
+    sort = args.get('sort', 'date')
+    if sort not in LISTING_SORTS:
+        return None, f"Invalid 'sort'; expected one of {sorted(LISTING_SORTS)}"
+    projection, error = _parse_projection(args)
+    if error:
+        return None, error
+
+    startups = get_all_startups(limit=per_page, offset=offset, sort=sort, **projection)
     total = count_all_startups()
-    payload = {
+    return {
         'items': startups,
         'total': total,
         **_pagination_vars(startups, total, page, per_page, offset),
-    }
+    }, None
+
+
+def _search_payload(args) -> tuple[Optional[dict], Optional[str]]:
+    """Build the ``/api/search`` body from query ``args``, or return an error message."""
+    query = args.get('q', '')
+    page, per_page, offset = _parse_pagination(max_per_page=200, args=args)
+    projection, error = _parse_projection(args)
+    if error:
+        return None, error
+
+    if query:
+        total = count_search_results(query)
+        startups = search_startups(query, limit=per_page, offset=offset, **projection)
+    else:
+        total = 0
+        startups = []
+    return {
+        'items': startups,
+        'total': total,
+        **_pagination_vars(startups, total, page, per_page, offset),
+    }, None
+
+
+# One WHERE id IN (...) lookup; matches the largest API page
+TOOLS_MAX_IDS = 200
+
+
+def _tools_payload(args) -> tuple[Optional[dict], Optional[str]]:
+    """Build the ``/api/tools`` body: rows for ``ids`` in the order given, unknown ids skipped."""
+    try:
+        ids = list(dict.fromkeys(int(part) for part in args.get('ids', '').split(',') if part.strip()))
+    except ValueError:
+        ids = []
+    if not ids or len(ids) > TOOLS_MAX_IDS:
+        return None, f"Invalid 'ids'; expected 1 to {TOOLS_MAX_IDS} comma-separated integers"
+    projection, error = _parse_projection(args)
+    if error:
+        return None, error
+    return {'items': get_startups_by_ids(ids, **projection), 'requested': len(ids)}, None
+
+
+def _counts_payload(args) -> tuple[Optional[dict], Optional[str]]:
+    """Per-source totals, plus the match count for ``q`` when given."""
+    payload: Dict[str, Any] = {'sources': get_source_counts()}
+    query = args.get('q', '')
+    if query:
+        payload['search_total'] = count_search_results(query)
+    return payload, None
+
+
+@app.route('/api/startups')
+@_cached("api")
+def api_startups():
+    """API endpoint for getting all startups, newest first or by score (``sort=score``)"""
+    payload, error = _startups_payload(request.args)
+    if error:
+        return jsonify({"error": error}), 400
     logger.info(
         "api.startups",
         extra={
             "event": "api.startups",
-            "page": page,
-            "per_page": per_page,
-            "returned": len(startups),
-            "total": total,
+            "sort": request.args.get('sort', 'date'),
+            "fields": request.args.get('fields'),
+            "desc_len": request.args.get('desc_len'),
+            "page": payload['page'],
+            "per_page": payload['per_page'],
+            "returned": len(payload['items']),
+            "total": payload['total'],
         },
     )
     return jsonify(payload)
 
 @app.route('/api/search')
+@_search_limited
+@_cached("api")
 def api_search():
     """API endpoint for searching startups"""
-    query = request.args.get('q', '')
-    page, per_page, offset = _parse_pagination(max_per_page=200)
-
-    if query:
-        total = count_search_results(query)
-        startups = search_startups(query, limit=per_page, offset=offset)
-    else:
-        total = 0
-        startups = []
-
-    payload = {
-        'items': startups,
-        'total': total,
-        **_pagination_vars(startups, total, page, per_page, offset),
-    }
+    payload, error = _search_payload(request.args)
+    if error:
+        return jsonify({"error": error}), 400
     logger.info(
         "api.search",
         extra={
             "event": "api.search",
-            "query": query,
-            "page": page,
-            "per_page": per_page,
-            "returned": len(startups),
-            "total": total,
+            "query": request.args.get('q', ''),
+            "fields": request.args.get('fields'),
+            "desc_len": request.args.get('desc_len'),
+            "page": payload['page'],
+            "per_page": payload['per_page'],
+            "returned": len(payload['items']),
+            "total": payload['total'],
         },
     )
     return jsonify(payload)
 
+@app.route('/api/tools')
+@_cached("api")
+def api_tools():
+    """API endpoint for a set of tools by id (``ids=1,2,3``), in one query"""
+    payload, error = _tools_payload(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+    logger.info(
+        "api.tools",
+        extra={"event": "api.tools", "requested": payload['requested'], "returned": len(payload['items'])},
+    )
+    return jsonify(payload)
+
+
+_BATCH_OPS = {
+    "startups": _startups_payload,
+    "search": _search_payload,
+    "tools": _tools_payload,
+    "counts": _counts_payload,
+}
+BATCH_MAX_REQUESTS = 20
+
+
+def _batch_args(raw: Any) -> Optional[Dict[str, str]]:
+    """Normalize a sub-request's JSON ``args`` to query-string values; lists become comma-joined."""
+    if raw is None:
+        return {}
+    if not isinstance(raw, dict):
+        return None
+    return {
+        str(name): ",".join(str(item) for item in value) if isinstance(value, list) else str(value)
+        for name, value in raw.items()
+    }
+
+
+def _batch_search_limited(op: str, args: Dict[str, str]) -> bool:
+    """Charge ``search_limiter`` for a sub-request that runs a full-text query, like /api/search would."""
+    if search_limiter is None or not (op == 'search' or (op == 'counts' and args.get('q'))):
+        return False
+    client_ip = _client_key()
+    if search_limiter.allow(client_ip):
+        return False
+    logger.warning(
+        "api.search.rate_limited",
+        extra={"event": "api.search.rate_limited", "client_ip": client_ip, "batch": True},
+    )
+    return True
+
+
+@app.route('/api/batch', methods=['POST'])
+def api_batch():
+    """Run several read sub-requests in one round trip, over one connection and snapshot.
+
+    The body is ``{"requests": [{"op": "search", "args": {"q": "rust"}}, ...]}``
+    where ``op`` is one of ``startups``, ``search``, ``tools`` or ``counts`` and
+    ``args`` are that endpoint's query parameters. Each entry of ``responses``
+    is ``{"status": ..., "body": ...}``, in request order; one bad sub-request
+    does not fail the others. Full-text sub-requests spend the caller's
+    search rate limit one by one, so a batch is no way around it.
+    """
+    data = request.get_json(silent=True)
+    subrequests = data.get('requests') if isinstance(data, dict) else None
+    if not isinstance(subrequests, list) or not subrequests:
+        return jsonify({"error": "Body must be {\"requests\": [...]}"}), 400
+    if len(subrequests) > BATCH_MAX_REQUESTS:
+        return jsonify({"error": f"Too many requests; at most {BATCH_MAX_REQUESTS}"}), 400
+
+    started = time.perf_counter()
+    responses = []
+    with shared_connection():
+        for subrequest in subrequests:
+            op = subrequest.get('op') if isinstance(subrequest, dict) else None
+            builder = _BATCH_OPS.get(op)
+            args = _batch_args(subrequest.get('args')) if builder else None
+            if builder is None:
+                error = f"Invalid 'op'; expected one of {sorted(_BATCH_OPS)}"
+            elif args is None:
+                error = "Invalid 'args'; expected an object"
+            elif _batch_search_limited(op, args):
+                responses.append({'status': 429, 'body': {'error': 'Rate limit exceeded'}})
+                continue
+            else:
+                payload, error = builder(args)
+            if error:
+                responses.append({'status': 400, 'body': {'error': error}})
+            else:
+                responses.append({'status': 200, 'body': payload})
+    logger.info(
+        "api.batch",
+        extra={
+            "event": "api.batch",
+            "ops": [subrequest.get('op') if isinstance(subrequest, dict) else None for subrequest in subrequests],
+            "failed": sum(1 for response in responses if response['status'] != 200),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        },
+    )
+    return jsonify({'responses': responses})
+
+@app.route('/api/scrape-runs')
+def api_scrape_runs():
+    """API endpoint for per-scraper run history, newest first"""
+    limit = min(max(_safe_int(request.args.get('limit', 50), 50), 1), 500)
+    scraper = request.args.get('scraper') or None
+    runs = get_scrape_runs(limit=limit, scraper=scraper)
+    logger.info(
+        "api.scrape_runs",
+        extra={
+            "event": "api.scrape_runs",
+            "scraper": scraper,
+            "limit": limit,
+            "returned": len(runs),
+        },
+    )
+    return jsonify({'items': runs, 'limit': limit})
+
+
+@app.route('/api/changes')
+@_cached("feed")
+def api_changes():
+    """API endpoint for rows inserted or updated after a change cursor.
+
+    Clients start with ``since=0`` and pass back ``next`` on every poll; an
+    unchanged ``next`` means nothing new has arrived.
+    """
+    since_arg = request.args.get('since', '0')
+    try:
+        since = int(since_arg)
+    except ValueError:
+        return jsonify({"error": "Invalid 'since' token"}), 400
+    if since < 0:
+        return jsonify({"error": "Invalid 'since' token"}), 400
+    limit = min(max(_safe_int(request.args.get('limit', 500), 500), 1), 1000)
+    # Fetch one extra row to report whether another page is waiting
+    rows = get_changes_since(since, limit=limit + 1)
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    next_token = items[-1]['change_seq'] if items else since
+    logger.info(
+        "api.changes",
+        extra={
+            "event": "api.changes",
+            "since": since,
+            "next": next_token,
+            "returned": len(items),
+            "has_more": has_more,
+        },
+    )
+    return jsonify({'items': items, 'next': str(next_token), 'has_more': has_more})
+
 
-# Chat endpoint rate limiting
-_chat_rate_limits: dict[str, list[float]] = defaultdict(list)
-_CHAT_RATE_LIMIT = int(os.getenv("CHATBOT_RATE_LIMIT", "10"))
-_CHAT_RATE_WINDOW = 60
+def _trend_bound(name: str) -> tuple[Optional[int], Optional[str]]:
+    """Parse an optional ISO ``since``/``until`` argument to epoch seconds; naive values are UTC."""
+    value = request.args.get(name)
+    if not value:
+        return None, None
+    parsed = _parse_iso_date(value)
+    if parsed is None:
+        return None, f"Invalid '{name}' date; expected ISO 8601"
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp()), None
+
+
+@app.route('/api/trends')
+def api_trends():
+    """API endpoint for tools found per day or week, split by source key or category.
+
+    Reads the daily rollup table, so cost scales with the range, not the
+    catalogue. ``buckets`` lists every bucket start in ``[since, until)``
+    (default: the last 30 days) and each series has one count per bucket.
+    """
+    granularity = request.args.get('granularity', 'day')
+    by = request.args.get('by', 'source')
+    if granularity not in TREND_GRANULARITIES:
+        return jsonify({"error": f"Invalid 'granularity'; expected one of {sorted(TREND_GRANULARITIES)}"}), 400
+    if by not in TREND_DIMENSIONS:
+        return jsonify({"error": f"Invalid 'by'; expected one of {sorted(TREND_DIMENSIONS)}"}), 400
+    until, error = _trend_bound('until')
+    if error is None:
+        since, error = _trend_bound('since')
+    if error:
+        return jsonify({"error": error}), 400
+    if until is None:
+        until = bucket_start(int(time.time())) + SECONDS_PER_DAY
+    if since is None:
+        since = until - _TREND_DEFAULT_DAYS * SECONDS_PER_DAY
+    step = SECONDS_PER_DAY * (7 if granularity == "week" else 1)
+    if since >= until:
+        return jsonify({"error": "'since' must be before 'until'"}), 400
+    if (until - bucket_start(since, granularity)) / step > _TREND_MAX_BUCKETS:
+        return jsonify({"error": f"Range too large; at most {_TREND_MAX_BUCKETS} buckets"}), 400
+
+    source_key = request.args.get('source') or None
+    category = request.args.get('category')
+    trend = _trend_series(since, until, granularity=granularity, by=by, source_key=source_key, category=category)
+    logger.info(
+        "api.trends",
+        extra={
+            "event": "api.trends",
+            "granularity": granularity,
+            "by": by,
+            "source": source_key,
+            "buckets": len(trend["buckets"]),
+        },
+    )
+    return jsonify({'granularity': granularity, 'by': by, **trend})
+
+
+_EXPORT_CHUNK_ROWS = 500
+
+
+def _export_filters():
+    """Parse source/since/until export filters, returning (filters, error_message)."""
+    filters = {
+        "source_key": request.args.get("source") or None,
+        "since": request.args.get("since") or None,
+        "until": request.args.get("until") or None,
+    }
+    for name in ("since", "until"):
+        if filters[name] and _parse_iso_date(filters[name]) is None:
+            return None, f"Invalid '{name}' date; expected ISO 8601"
+    return filters, None
+
+
+def _export_response(filters: dict, fmt: str, generate) -> Response:
+    """Wrap an export row generator in a streaming response with logging."""
+    logger.info(
+        "api.export",
+        extra={"event": "api.export", "format": fmt, **filters},
+    )
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    response = Response(generate(), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f"attachment; filename=devtools.{fmt}"
+    return response
+
+
+@app.route('/api/export.ndjson')
+def api_export_ndjson():
+    """Stream the full dataset as newline-delimited JSON"""
+    filters, error = _export_filters()
+    if error:
+        return jsonify({"error": error}), 400
+
+    def generate():
+        return iter_ndjson(iter_startups(**filters), chunk_rows=_EXPORT_CHUNK_ROWS)
+
+    return _export_response(filters, "ndjson", generate)
+
+
+@app.route('/api/export.csv')
+def api_export_csv():
+    """Stream the full dataset as CSV"""
+    filters, error = _export_filters()
+    if error:
+        return jsonify({"error": error}), 400
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for index, row in enumerate(iter_startups(**filters), start=1):
+            writer.writerow([row[column] for column in EXPORT_COLUMNS])
+            if index % _EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        yield buffer.getvalue()
+
+    return _export_response(filters, "csv", generate)
+
+
+# Agent runs take several LLM round trips, so they run on a bounded pool of
+# background threads instead of tying up one of the two sync workers; clients
+# poll /api/chat/jobs/<id> for the answer (see chat_jobs).
+chat_jobs = ChatJobs(
+    run=lambda *args, **kwargs: generate_chat_response(*args, **kwargs),
+    path=Path(os.getenv("DEVTOOLS_CHAT_JOBS_PATH") or DATA_DIR / "chat_jobs.db"),
+    max_workers=_safe_int(os.getenv("DEVTOOLS_CHAT_WORKERS"), 2),
+    max_queued=_safe_int(os.getenv("DEVTOOLS_CHAT_QUEUE_SIZE"), 8),
+    deadline_seconds=_safe_float_env("DEVTOOLS_CHAT_DEADLINE_SECONDS", 60.0),
+)
+# A waiting poll holds a whole sync gunicorn worker, so by default polls answer
+# at once and the page backs off between them. Only raise this on threaded workers.
+CHAT_MAX_WAIT_SECONDS = _safe_float_env("DEVTOOLS_CHAT_MAX_WAIT_SECONDS", 0.0)
 
 
 @app.route('/api/chat', methods=['POST'])
 def api_chat():
-    """API endpoint for chatbot tool recommendations."""
-    client_ip = request.headers.get("X-Forwarded-For", request.remote_addr)
-    now = time.time()
-    _chat_rate_limits[client_ip] = [
-        t for t in _chat_rate_limits[client_ip] if now - t < _CHAT_RATE_WINDOW
-    ]
-    if len(_chat_rate_limits[client_ip]) >= _CHAT_RATE_LIMIT:
-        logger.warning(
-            "api.chat.rate_limited",
-            extra={"event": "api.chat.rate_limited", "client_ip": client_ip},
-        )
-        return jsonify({
-            'error': 'Rate limit exceeded',
-            'response': 'You are sending messages too quickly. Please wait a moment and try again.',
-            'tools': [],
-        }), 429
+    """Queue a chatbot request; answers 202 with the job to poll."""
     data = request.get_json(silent=True)
     user_message = (data.get("message", "") if data else "").strip()
     if not user_message:
         return jsonify({"error": "Message is required"}), 400
     if len(user_message) > 500:
         return jsonify({"error": "Message too long (max 500 characters)"}), 400
+    # Charged only once the message is accepted, so bad requests never spend the budget
+    client_ip = _client_key()
+    if not chat_limiter.allow(client_ip):
+        return _chat_rate_limited(client_ip)
 
-    _chat_rate_limits[client_ip].append(now)
     session_id = (data.get("session_id") if data else None)
-    result = generate_chat_response(user_message, session_id=session_id)
+    try:
+        job = chat_jobs.submit(user_message, session_id=session_id)
+    except QueueFull:
+        logger.warning("api.chat.busy", extra={"event": "api.chat.busy", **chat_jobs.stats()})
+        response = jsonify({
+            'error': 'Chat is busy',
+            'response': 'The assistant is busy right now. Please try again in a few seconds.',
+            'tools': [],
+        })
+        response.headers["Retry-After"] = "5"
+        return response, 503
+
+    poll_url = f"/api/chat/jobs/{job['job_id']}"
     logger.info(
         "api.chat",
-        extra={
-            "event": "api.chat",
-            "message_length": len(user_message),
-            "tools_found": len(result.get("tools", [])),
-        },
+        extra={"event": "api.chat", "message_length": len(user_message), "job_id": job["job_id"]},
     )
-    return jsonify(result)
+    response = jsonify({
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "poll": poll_url,
+        "deadline_seconds": chat_jobs.deadline_seconds,
+    })
+    response.headers["Location"] = poll_url
+    return response, 202
+
+
+@app.route('/api/chat/jobs/<job_id>')
+def api_chat_job(job_id):
+    """Chat job status; ``?wait=N`` holds the request up to N seconds (capped) for the answer."""
+    try:
+        wait = float(request.args.get("wait", 0))
+    except ValueError:
+        wait = -1.0
+    # Also rejects NaN, which would never time out
+    if not wait >= 0:
+        return jsonify({"error": "wait must be a number of seconds"}), 400
+    job = chat_jobs.get(job_id, wait=min(wait, CHAT_MAX_WAIT_SECONDS))
+    if job is None:
+        return jsonify({"error": "Unknown chat job"}), 404
+    response = jsonify(job)
+    response.headers["Cache-Control"] = "no-store"
+    return response
 
 
 @app.route('/health')
@@ -549,6 +1165,11 @@ def health_check():
         'timestamp': datetime.now().isoformat(),
         'database': 'connected',
         'trace_filter': filter_status,
+        'response_cache': response_cache.stats() if response_cache is not None else None,
+        'chat_jobs': chat_jobs.stats(),
+        'rate_limits': {
+            limiter.name: limiter.stats() for limiter in (chat_limiter, search_limiter) if limiter is not None
+        },
     })
 
 
@@ -562,9 +1183,40 @@ def _parse_iso_date(date_str):
         return None
 
 
+@lru_cache(maxsize=4096)
+def _format_epoch_day(day: int) -> str:
+    """Format a UTC day number (epoch seconds // 86400); listings share few distinct days."""
+    return datetime.fromtimestamp(day * 86400, timezone.utc).strftime('%B %d, %Y')
+
+
+@lru_cache(maxsize=4096)
+def _format_epoch_iso_day(day: int) -> str:
+    """Render a UTC day number as ``YYYY-MM-DD`` for trend bucket labels."""
+    return datetime.fromtimestamp(day * SECONDS_PER_DAY, timezone.utc).strftime('%Y-%m-%d')
+
+
+@app.template_global()
+def listing_href(base_path: str, page: int = 1, per_page: int = LISTING_PER_PAGE, sort: str = 'date') -> str:
+    """Build a listing link carrying only non-default parameters.
+
+    Default-size pages then come out as the bare path or ``?page=N``, the two
+    forms nginx maps to the files static_export.py writes.
+    """
+    params: Dict[str, Any] = {}
+    if page > 1:
+        params['page'] = page
+    if per_page != LISTING_PER_PAGE:
+        params['per_page'] = per_page
+    if sort != 'date':
+        params['sort'] = sort
+    return f"{base_path}?{urlencode(params)}" if params else base_path
+
+
 @app.template_filter('format_date')
 def format_date(date_str):
     """Format date for display"""
+    if isinstance(date_str, (int, float)) and not isinstance(date_str, bool):
+        return _format_epoch_day(int(date_str) // 86400)
     dt = _parse_iso_date(date_str)
     return dt.strftime('%B %d, %Y') if dt else date_str
 
@@ -572,6 +1224,8 @@ def format_date(date_str):
 @app.template_filter('format_datetime')
 def format_datetime(date_str):
     """Format datetime for display"""
+    if isinstance(date_str, (int, float)) and not isinstance(date_str, bool):
+        return datetime.fromtimestamp(date_str, timezone.utc).strftime('%B %d, %Y at %I:%M %p')
     dt = _parse_iso_date(date_str)
     return dt.strftime('%B %d, %Y at %I:%M %p') if dt else date_str
 
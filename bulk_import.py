@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Load a large historical backfill from NDJSON or CSV.
+
+Accepts the same shape ``/api/export.ndjson`` and ``/api/export.csv`` produce
+(``name``, ``url``, ``description``, ``source``, ``score`` and ``date_found``
+or ``found_at``), so an export from one deployment can seed another:
+
+    python bulk_import.py archive.ndjson
+    python bulk_import.py --format csv - < archive.csv
+"""
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, TextIO
+
+from dotenv import load_dotenv
+
+BASE_DIR = Path(__file__).resolve().parent
+load_dotenv(BASE_DIR / ".env")
+
+from logging_config import get_logger
+from storage import bulk_load_startups, init_db, run_maintenance
+
+logger = get_logger("devtools.bulk_import")
+
+FORMATS = ("ndjson", "csv")
+_SUFFIX_FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "ndjson", ".csv": "csv"}
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per NDJSON line or CSV row; blank lines are skipped."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def detect_format(path: str) -> str:
+    fmt = _SUFFIX_FORMATS.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"cannot tell the format of {path!r}; pass --format")
+    return fmt
+
+
+def main(argv=None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Bulk load startups from NDJSON or CSV.")
+    parser.add_argument("path", help="Input file, or - for stdin.")
+    parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension.")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per transaction.")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or detect_format(args.path)
+    init_db()
+    if args.path == "-":
+        report = bulk_load_startups(read_records(sys.stdin, fmt), batch_size=args.batch_size)
+    else:
+        with open(args.path, newline="", encoding="utf-8") as stream:
+            report = bulk_load_startups(read_records(stream, fmt), batch_size=args.batch_size)
+    logger.info("bulk_import.complete", extra={"event": "bulk_import.complete", "path": args.path, **report})
+    # A backfill reshapes the table; refresh planner statistics straight away
+    try:
+        run_maintenance()
+    except Exception:
+        logger.exception("bulk_import.maintenance_failed", extra={"event": "bulk_import.maintenance_failed"})
+    print(json.dumps(report))
+    return report
+
+
+if __name__ == "__main__":
+    main()
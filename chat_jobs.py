@@ -0,0 +1,231 @@
+"""Run chat requests off the request path, on a bounded pool of background threads.
+
+An agent run makes several LLM round trips and can take tens of seconds. The
+app has two ``sync`` gunicorn workers, so running it inline stalls every page
+behind a couple of chats. Instead ``ChatJobs.submit`` queues the run and
+returns a job id straight away; the client polls ``get`` (or waits on it for a
+few seconds) until the job is done.
+
+Each gunicorn worker owns a small thread pool of ``max_workers`` threads.
+Admission is counted per host, not per worker: once ``max_workers +
+max_queued`` jobs are queued or running in the shared jobs file, ``submit``
+raises ``QueueFull`` and the caller sheds load with a 503 instead of piling up
+work. Adding gunicorn workers therefore adds threads, not queue slots.
+
+Job state lives in a SQLite file shared by every worker on the host, because
+the poll may land on a different worker than the one running the job. Every
+job carries a deadline: a job still queued when it passes is never started,
+and one that has not finished by then is reported as ``expired``. That also
+covers jobs lost when a worker is recycled mid-run. A run that raises is
+reported as ``failed``.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from logging_config import get_logger
+
+logger = get_logger("devtools.chat_jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+EXPIRED = "expired"
+FAILED = "failed"
+# How often a waiting request re-reads the job
+_WAIT_INTERVAL = 0.25
+
+
+class QueueFull(Exception):
+    """Raised by ``ChatJobs.submit`` when every worker thread and queue slot is taken."""
+
+
+class ChatJobs:
+    """Bounded background executor for chat runs, with job state in a shared SQLite file."""
+
+    def __init__(
+        self,
+        run: Callable[..., Dict[str, Any]],
+        path: Path,
+        max_workers: int = 2,
+        max_queued: int = 8,
+        deadline_seconds: float = 60.0,
+        retention_seconds: float = 600.0,
+    ) -> None:
+        self.run = run
+        self.path = Path(path)
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max(0, max_queued)
+        self.deadline_seconds = deadline_seconds
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._ready = False
+        self.submitted = self.completed = self.expired = self.rejected = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._ready:
+            # Created on first use so workers that never chat never touch the file
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chat_jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    deadline_at REAL NOT NULL,
+                    finished_at REAL,
+                    result TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_jobs_created ON chat_jobs(created_at)")
+            self._ready = True
+        return conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        conn = self._connection()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Threads do not survive a fork, so with preload_app each gunicorn
+        # worker starts its own pool on first use
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="chat-job")
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def submit(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """Queue ``run(*args, **kwargs)``; returns the new job, or raises ``QueueFull``."""
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        deadline_at = now + self.deadline_seconds
+        conn = self._connection()
+        try:
+            # IMMEDIATE takes the write lock first, so two workers cannot both
+            # count the last free slot and admit a job each
+            conn.execute("BEGIN IMMEDIATE")
+            (pending,) = conn.execute(
+                "SELECT COUNT(*) FROM chat_jobs WHERE status IN (?, ?) AND deadline_at > ?",
+                (QUEUED, RUNNING, now),
+            ).fetchone()
+            if pending >= self.max_workers + self.max_queued:
+                conn.execute("ROLLBACK")
+                with self._lock:
+                    self.rejected += 1
+                raise QueueFull()
+            conn.execute(
+                "INSERT INTO chat_jobs (id, status, created_at, deadline_at) VALUES (?, ?, ?, ?)",
+                (job_id, QUEUED, now, deadline_at),
+            )
+            conn.execute("DELETE FROM chat_jobs WHERE created_at < ?", (now - self.retention_seconds,))
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        with self._lock:
+            self.submitted += 1
+            pool = self._pool()
+        try:
+            # The request's log context (request_id, ...) follows the job
+            pool.submit(copy_context().run, self._work, job_id, deadline_at, args, kwargs)
+        except RuntimeError:
+            # The pool is shutting down with the worker; free the slot
+            self._execute("UPDATE chat_jobs SET status = ? WHERE id = ?", (FAILED, job_id))
+            raise
+        return {"job_id": job_id, "status": QUEUED, "deadline_at": deadline_at}
+
+    def _work(self, job_id: str, deadline_at: float, args: tuple, kwargs: dict) -> None:
+        started = time.time()
+        try:
+            if started >= deadline_at:
+                # The client has stopped waiting; skip the LLM calls entirely
+                self._execute("UPDATE chat_jobs SET status = ? WHERE id = ?", (EXPIRED, job_id))
+                with self._lock:
+                    self.expired += 1
+                logger.warning("chat_jobs.expired", extra={"event": "chat_jobs.expired", "job_id": job_id})
+                return
+            self._execute("UPDATE chat_jobs SET status = ? WHERE id = ?", (RUNNING, job_id))
+            result = self.run(*args, **kwargs)
+            self._execute(
+                "UPDATE chat_jobs SET status = ?, finished_at = ?, result = ? WHERE id = ?",
+                (DONE, time.time(), json.dumps(result), job_id),
+            )
+            with self._lock:
+                self.completed += 1
+            logger.info(
+                "chat_jobs.complete",
+                extra={
+                    "event": "chat_jobs.complete",
+                    "job_id": job_id,
+                    "duration_ms": round((time.time() - started) * 1000, 2),
+                },
+            )
+        except Exception:
+            logger.exception("chat_jobs.failed", extra={"event": "chat_jobs.failed", "job_id": job_id})
+            try:
+                self._execute("UPDATE chat_jobs SET status = ? WHERE id = ?", (FAILED, job_id))
+            except sqlite3.Error:
+                pass
+
+    def get(self, job_id: str, wait: float = 0.0) -> Optional[Dict[str, Any]]:
+        """Return the job, waiting up to ``wait`` seconds for it to finish; None when unknown."""
+        give_up = time.monotonic() + wait
+        while True:
+            rows = self._execute(
+                "SELECT status, deadline_at, result FROM chat_jobs WHERE id = ?", (job_id,)
+            )
+            if not rows:
+                return None
+            status, deadline_at, result = rows[0]
+            if status in (QUEUED, RUNNING) and time.time() >= deadline_at:
+                status = EXPIRED
+            if status in (DONE, EXPIRED, FAILED) or time.monotonic() >= give_up:
+                job = {"job_id": job_id, "status": status}
+                if status == DONE:
+                    job.update(json.loads(result))
+                return job
+            time.sleep(_WAIT_INTERVAL)
+
+    def pending(self) -> int:
+        """Jobs queued or running on this host whose deadline has not passed."""
+        (count,) = self._execute(
+            "SELECT COUNT(*) FROM chat_jobs WHERE status IN (?, ?) AND deadline_at > ?",
+            (QUEUED, RUNNING, time.time()),
+        )[0]
+        return count
+
+    def stats(self) -> Dict[str, object]:
+        try:
+            pending = self.pending()
+        except sqlite3.Error:
+            pending = None
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queued": self.max_queued,
+                "pending": pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "expired": self.expired,
+                "rejected": self.rejected,
+            }
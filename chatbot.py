@@ -15,7 +15,7 @@ from agents import Agent, Runner, function_tool
 from agents.items import ToolCallOutputItem
 from ddtrace.llmobs import LLMObs
 
-from database import count_all_startups, search_startups
+from storage import count_all_startups, search_startups
 from logging_config import get_logger
 
 logger = get_logger("devtools.chatbot")
@@ -0,0 +1,171 @@
+"""Optional in-worker columnar snapshot for listing, source filtering and counting.
+
+Startups only change when a scraper runs, yet every list page, source tab and
+count used to round-trip through SQLite. With ``DEVTOOLS_COLUMNAR_SNAPSHOT=1``
+(and NumPy installed) each worker keeps ids, epoch dates and source codes as
+NumPy arrays, pre-sorted newest first, and answers those reads with array
+slices and vectorized masks. Only the visible page is hydrated from SQLite, by
+primary key.
+
+The snapshot is rebuilt when ``database.get_change_generation()`` moves. That
+probe runs at most once every ``DEVTOOLS_SNAPSHOT_REFRESH_SECONDS`` (default 2),
+so reads may lag a write by that long. While one thread rebuilds, the others
+keep serving the previous snapshot.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import database
+from database import SOURCE_REGISTRY, classify_source
+from logging_config import get_logger
+
+try:
+    import numpy as np
+except (ImportError, ModuleNotFoundError):
+    np = None
+
+logger = get_logger("devtools.snapshot")
+
+_KEYS = (*SOURCE_REGISTRY, "other")
+_NULL_DATE = -(2 ** 63)
+
+
+def snapshot_enabled() -> bool:
+    """Return True when the snapshot is switched on and NumPy is importable."""
+    return os.getenv("DEVTOOLS_COLUMNAR_SNAPSHOT", "").lower() in ("1", "true", "yes") and np is not None
+
+
+class ColumnarSnapshot:
+    """Immutable arrays describing every startup at one change generation."""
+
+    def __init__(self, generation: int, ids, found_at, source_codes, sources: list[str]) -> None:
+        self.generation = generation
+        self.ids = ids
+        self.sources = sources
+        self._source_index = {value: code for code, value in enumerate(sources)}
+        self.source_codes = source_codes
+        # Newest first, ties broken by id like ORDER BY found_at DESC, id DESC
+        self.order = np.lexsort((ids, found_at))[::-1]
+        key_of_source = np.array([_KEYS.index(classify_source(source)) for source in sources], dtype=np.int8)
+        self.row_keys = key_of_source[source_codes]
+        ordered_keys = self.row_keys[self.order]
+        self.key_orders = {key: self.order[ordered_keys == index] for index, key in enumerate(_KEYS)}
+        counts = np.bincount(self.row_keys, minlength=len(_KEYS))
+        self._source_counts = {"total": int(len(ids))}
+        self._source_counts.update((key, int(counts[index])) for index, key in enumerate(_KEYS))
+        self._source_orders: Dict[int, object] = {}
+
+    @classmethod
+    def build(cls) -> "ColumnarSnapshot":
+        """Load the listing columns from SQLite and encode them as arrays."""
+        started = time.perf_counter()
+        generation, rows = database.load_listing_columns()
+        source_table: Dict[str, int] = {}
+        codes = [source_table.setdefault(source or "", len(source_table)) for _, _, source in rows]
+        snapshot = cls(
+            generation,
+            np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)),
+            # NULL dates sort last, as they do in SQLite's descending order
+            np.fromiter((_NULL_DATE if row[1] is None else row[1] for row in rows), dtype=np.int64, count=len(rows)),
+            np.asarray(codes, dtype=np.int32),
+            list(source_table),
+        )
+        logger.info(
+            "snapshot.built",
+            extra={
+                "event": "snapshot.built",
+                "generation": generation,
+                "rows": len(rows),
+                "sources": len(source_table),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "bytes": snapshot.nbytes,
+            },
+        )
+        return snapshot
+
+    @property
+    def nbytes(self) -> int:
+        return int(
+            self.ids.nbytes + self.source_codes.nbytes + self.order.nbytes + self.row_keys.nbytes
+            + sum(order.nbytes for order in self.key_orders.values())
+        )
+
+    def _ordered(self, source_key: Optional[str]):
+        return self.key_orders[source_key] if source_key in SOURCE_REGISTRY else self.order
+
+    def listing_ids(self, source_key: Optional[str] = None, limit: Optional[int] = None, offset: Optional[int] = None) -> list[int]:
+        """Ids for one newest-first page, over all rows or one source key."""
+        start = offset or 0
+        end = None if limit is None else start + limit
+        return self.ids[self._ordered(source_key)[start:end]].tolist()
+
+    def count(self, source_key: Optional[str] = None) -> int:
+        return int(len(self._ordered(source_key)))
+
+    def source_counts(self) -> Dict[str, int]:
+        return dict(self._source_counts)
+
+    def related_ids(self, source: str, exclude_id: int, limit: int = 4) -> list[int]:
+        """Newest ids sharing ``source``'s key (or exact source for unregistered ones)."""
+        source_key = classify_source(source)
+        if source_key in SOURCE_REGISTRY:
+            ordered = self.key_orders[source_key]
+        else:
+            code = self._source_index.get(source)
+            if code is None:
+                return []
+            ordered = self._source_orders.get(code)
+            if ordered is None:
+                # Unregistered sources all live in the "other" bucket; mask only that
+                # once per source and keep the result, since the arrays never change
+                others = self.key_orders["other"]
+                ordered = self._source_orders.setdefault(code, others[self.source_codes[others] == code])
+        candidates = self.ids[ordered[:limit + 1]]
+        return candidates[candidates != exclude_id][:limit].tolist()
+
+
+_snapshot: Optional[ColumnarSnapshot] = None
+_checked_at = 0.0
+_refresh_lock = threading.Lock()
+
+
+def _refresh_interval() -> float:
+    try:
+        return max(float(os.getenv("DEVTOOLS_SNAPSHOT_REFRESH_SECONDS", "2")), 0.0)
+    except ValueError:
+        return 2.0
+
+
+def current() -> Optional[ColumnarSnapshot]:
+    """Return an up-to-date snapshot, or None when disabled or unavailable."""
+    global _snapshot, _checked_at
+    if not snapshot_enabled():
+        return None
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _checked_at < _refresh_interval():
+        return snapshot
+    # Only the first caller waits for a build; later ones serve the old arrays
+    if not _refresh_lock.acquire(blocking=snapshot is None):
+        return snapshot
+    try:
+        if _snapshot is not None and time.monotonic() - _checked_at < _refresh_interval():
+            return _snapshot
+        if _snapshot is None or database.get_change_generation() != _snapshot.generation:
+            _snapshot = ColumnarSnapshot.build()
+        _checked_at = time.monotonic()
+    except Exception:
+        logger.exception("snapshot.refresh_failed", extra={"event": "snapshot.refresh_failed"})
+    finally:
+        _refresh_lock.release()
+    return _snapshot
+
+
+def reset() -> None:
+    """Drop the cached snapshot so the next read rebuilds it."""
+    global _snapshot, _checked_at
+    with _refresh_lock:
+        _snapshot = None
+        _checked_at = 0.0
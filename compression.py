@@ -0,0 +1,92 @@
+"""Response compression: gzip always, brotli when the ``brotli`` package is installed.
+
+``choose_encoding`` negotiates against ``Accept-Encoding`` and ``encode`` does
+the work. Two callers use them:
+
+* ``ResponseCache`` keeps the encoded variants next to each cached body, so a
+  page is compressed once per generation and cache hits only copy bytes.
+* ``compress_response`` is an ``after_request`` hook for everything else
+  (uncached views, error pages). It skips streamed bodies such as the exports,
+  responses that are already encoded, small bodies and binary content types.
+
+Bodies under ``MIN_BYTES`` go out as-is: below roughly one packet compression
+saves no round trips and still costs CPU on both ends.
+"""
+
+import gzip
+import os
+from typing import Optional
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # optional; gzip alone covers every client
+    brotli = None
+
+# Off when a proxy in front already compresses
+ENABLED = os.getenv("DEVTOOLS_RESPONSE_COMPRESSION", "1").lower() in ("1", "true", "yes")
+MIN_BYTES = int(os.getenv("DEVTOOLS_RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("DEVTOOLS_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("DEVTOOLS_BROTLI_QUALITY", "5"))
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def supported_encodings() -> tuple:
+    """Encodings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding) -> Optional[str]:
+    """Pick the best supported encoding from a parsed ``Accept-Encoding``, or None."""
+    if not ENABLED:
+        return None
+    for encoding in supported_encodings():
+        if accept_encoding[encoding] > 0:
+            return encoding
+    return None
+
+
+def compressible(content_type: Optional[str], size: int) -> bool:
+    return size >= MIN_BYTES and bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def encode(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output a pure function of the body
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def apply_encoding(response: Response, body: bytes, encoding: Optional[str]) -> Response:
+    """Set an already-encoded ``body`` on ``response`` with matching headers."""
+    response.vary.add("Accept-Encoding")
+    if encoding is None:
+        return response
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def compress_response(response: Response) -> Response:
+    """``after_request`` hook compressing eligible responses the cache did not handle."""
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    body = response.get_data()
+    if not compressible(response.mimetype, len(body)):
+        return response
+    encoding = choose_encoding(request.accept_encodings)
+    return apply_encoding(response, encode(body, encoding) if encoding else body, encoding)
@@ -1,14 +1,19 @@
 """SQLite persistence layer with FTS5 full-text search for developer tools."""
 
+import html
 import os
 import re
 import sqlite3
 import time
+import uuid
+import zlib
 from contextlib import contextmanager
-from datetime import datetime
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, Iterator, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
 
+import scrape_metrics
 from logging_config import get_logger
 
 logger = get_logger("devtools.db")
@@ -34,8 +39,10 @@ SOURCE_REGISTRY: dict[str, dict] = {
     },
     "hackernews": {
         "display": "Hacker News",
-        "where": "source LIKE ? OR source LIKE ?",
-        "params": ["Hacker News%", "Show HN%"],
+        # GLOB is case-sensitive like the match below, so SQLite can serve it
+        # from idx_startups_source_found_at as a range scan; LIKE would force a SCAN.
+        "where": "source GLOB ? OR source GLOB ?",
+        "params": ["Hacker News*", "Show HN*"],
         "match": lambda s: s.startswith("Hacker News") or s.startswith("Show HN"),
     },
     "producthunt": {
@@ -56,6 +63,44 @@ def classify_source(source: str) -> str:
             return key
     return "other"
 
+# Columns list queries select from the narrow startups table, in API order
+STARTUP_COLUMNS = "id, name, url, summary, category, source, score, date_found, found_at"
+# Full descriptions may be stored zlib-compressed (see compress_description);
+# reads inflate them in SQL so every caller sees text.
+_DESCRIPTION_SELECT = (
+    "CASE WHEN typeof(d.description) = 'blob' THEN zdecompress(d.description) ELSE d.description END"
+)
+# Detail, search and change-feed reads add the full text from startup_details
+DETAIL_COLUMNS = (
+    ", ".join(f"s.{column.strip()}" for column in STARTUP_COLUMNS.split(","))
+    + f", {_DESCRIPTION_SELECT} AS description"
+)
+DETAIL_JOIN = "startups s LEFT JOIN startup_details d ON d.startup_id = s.id"
+# Fields the JSON API can select with ?fields=, in response order
+API_FIELDS = tuple(column.strip() for column in STARTUP_COLUMNS.split(",")) + ("description",)
+
+
+def _projection(fields: Sequence[str], desc_len: Optional[int] = None) -> tuple[str, bool]:
+    """Return the SELECT list for ``fields`` and whether it needs ``startup_details``.
+
+    ``desc_len`` truncates the description inside SQLite, so the full text is
+    never copied into Python.
+    """
+    unknown = set(fields) - set(API_FIELDS)
+    if unknown:
+        raise ValueError(f"Unsupported fields: {sorted(unknown)}")
+    columns = []
+    for field in API_FIELDS:
+        if field not in fields:
+            continue
+        if field != "description":
+            columns.append(f"s.{field}")
+        elif desc_len is not None:
+            columns.append(f"substr({_DESCRIPTION_SELECT}, 1, {int(desc_len)}) AS description")
+        else:
+            columns.append(f"{_DESCRIPTION_SELECT} AS description")
+    return ", ".join(columns), "description" in fields
+
 DEFAULT_DATA_DIR = Path(os.getcwd()) / "data"
 DATA_DIR = Path(os.getenv("DEVTOOLS_DATA_DIR", DEFAULT_DATA_DIR))
 DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -63,13 +108,44 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 DB_PATH = Path(os.getenv("DEVTOOLS_DB_PATH", DATA_DIR / "startups.db"))
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 DB_NAME = str(DB_PATH)
+# Replica web nodes serve a snapshot shipped by the scraper node (replication.py)
+# and must never write to it or migrate it.
+DB_READONLY = os.getenv("DEVTOOLS_DB_READONLY", "").lower() in ("1", "true", "yes")
+
+
+# Opt-in: long descriptions are stored as zlib BLOBs; plain TEXT rows stay readable
+COMPRESS_DESCRIPTIONS = os.getenv("DEVTOOLS_COMPRESS_DESCRIPTIONS", "").lower() in ("1", "true", "yes")
+# Shorter text rarely shrinks enough to pay for the inflate on read
+COMPRESS_MIN_BYTES = int(os.getenv("DEVTOOLS_COMPRESS_MIN_BYTES", "512"))
+
+
+def compress_description(text: Optional[str]) -> Any:
+    """Return ``text`` in its stored form: a zlib BLOB when enabled and worthwhile, else unchanged."""
+    if not COMPRESS_DESCRIPTIONS or not text:
+        return text
+    raw = text.encode("utf-8")
+    if len(raw) < COMPRESS_MIN_BYTES:
+        return text
+    packed = zlib.compress(raw, 6)
+    return packed if len(packed) < len(raw) else text
+
+
+def decompress_description(value: Any) -> Any:
+    """Inverse of ``compress_description``; registered on connections as ``zdecompress()``."""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
 
 
 def _connect() -> sqlite3.Connection:
     """Create a new SQLite connection with Row factory enabled."""
     start = time.perf_counter()
-    conn = sqlite3.connect(DB_PATH)
+    if DB_READONLY:
+        conn = sqlite3.connect(f"{Path(DB_PATH).resolve().as_uri()}?mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    conn.create_function("zdecompress", 1, decompress_description, deterministic=True)
     duration = round((time.perf_counter() - start) * 1000, 2)
     logger.debug(
         "db.connect",
@@ -78,13 +154,43 @@ def _connect() -> sqlite3.Connection:
     return conn
 
 
+# Set by shared_connection(); reads inside the block reuse it instead of connecting
+_shared_conn: ContextVar[Optional[sqlite3.Connection]] = ContextVar("devtools_shared_conn", default=None)
+
+
 @contextmanager
 def _db_connection() -> Iterator[sqlite3.Connection]:
     """Open a database connection and ensure it is closed after use."""
+    shared = _shared_conn.get()
+    if shared is not None:
+        yield shared
+        return
+    conn = _connect()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def shared_connection() -> Iterator[sqlite3.Connection]:
+    """Serve every read in the block from one connection and one read transaction.
+
+    Batched API calls use this so several lookups pay for a single connect and
+    all see the same snapshot. It is only meant for reads: a write inside the
+    block would sit in the transaction and be rolled back on exit.
+    """
+    if _shared_conn.get() is not None:
+        yield _shared_conn.get()
+        return
     conn = _connect()
+    token = _shared_conn.set(conn)
     try:
+        conn.execute("BEGIN")
         yield conn
     finally:
+        _shared_conn.reset(token)
+        conn.rollback()
         conn.close()
 
 
@@ -101,11 +207,453 @@ def _append_pagination(query: str, params: list, limit: Optional[int], offset: O
     return query, params
 
 
+def to_epoch(value: Any) -> Optional[int]:
+    """Convert a datetime, ISO string or number into integer UTC epoch seconds.
+
+    Naive datetimes and strings are taken as UTC, the same as the ``since``/
+    ``until`` bounds of ``/api/trends``, so a filter means the same instant
+    whatever the server's timezone. Returns None for empty or unparseable values.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return None
+
+
+def epoch_to_iso(epoch: int) -> str:
+    """Render epoch seconds as the canonical ISO 8601 UTC string stored in ``date_found``."""
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def _ensure_column(c: sqlite3.Cursor, table: str, column: str, ddl: str) -> bool:
+    """Add a column to an existing table if it is missing, returning True when added."""
+    columns = {row[1] for row in c.execute(f"PRAGMA table_info({table})").fetchall()}
+    if column in columns:
+        return False
+    c.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+    return True
+
+
+def _backfill_found_at(c: sqlite3.Cursor) -> None:
+    """Populate ``found_at`` and canonicalise ``date_found`` for rows predating the column."""
+    rows = c.execute("SELECT id, date_found FROM startups WHERE found_at IS NULL").fetchall()
+    updates = []
+    for row_id, date_found in rows:
+        epoch = to_epoch(date_found)
+        if epoch is not None:
+            updates.append((epoch, epoch_to_iso(epoch), row_id))
+    if updates:
+        c.executemany("UPDATE startups SET found_at = ?, date_found = ? WHERE id = ?", updates)
+        logger.info(
+            "db.migrate.found_at",
+            extra={"event": "db.migrate.found_at", "rows": len(updates), "unparseable": len(rows) - len(updates)},
+        )
+
+
+SUMMARY_LENGTH = 160
+_CATEGORY_PREFIX = re.compile(r'^\s*\[([^\]]{1,40})\]\s*')
+_HTML_TAG = re.compile(r'<[^>]+>')
+
+
+def summarize_description(description: Optional[str]) -> tuple[Optional[str], Optional[str]]:
+    """Split a description into a plain-text list summary and its ``[Category]`` tag."""
+    if not description:
+        return None, None
+    category = None
+    match = _CATEGORY_PREFIX.match(description)
+    if match:
+        category = match.group(1).strip()
+        description = description[match.end():]
+    text = " ".join(html.unescape(_HTML_TAG.sub(" ", description)).split())
+    if len(text) > SUMMARY_LENGTH:
+        text = text[:SUMMARY_LENGTH].rsplit(" ", 1)[0].rstrip(" ,.;:") + "..."
+    return text or None, category
+
+
+def _migrate_descriptions(c: sqlite3.Cursor) -> None:
+    """Move ``startups.description`` into ``startup_details`` and derive summaries."""
+    columns = {row[1] for row in c.execute("PRAGMA table_info(startups)").fetchall()}
+    if "description" not in columns:
+        return
+    # Triggers and the old FTS table reference the column; they are recreated below
+    for trigger in ("startups_ai", "startups_ad", "startups_au", "startups_seq_au"):
+        c.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    c.execute("DROP TABLE IF EXISTS startups_fts")
+    rows = c.execute("SELECT id, description FROM startups").fetchall()
+    c.executemany(
+        "INSERT OR IGNORE INTO startup_details (startup_id, description) VALUES (?, ?)",
+        rows,
+    )
+    c.executemany(
+        "UPDATE startups SET summary = ?, category = ? WHERE id = ?",
+        [(*summarize_description(description), row_id) for row_id, description in rows],
+    )
+    c.execute("ALTER TABLE startups DROP COLUMN description")
+    logger.info(
+        "db.migrate.descriptions",
+        extra={"event": "db.migrate.descriptions", "rows": len(rows)},
+    )
+
+
+_EMBEDDED_SCORE = re.compile(r'^(.*) \(score: (-?\d+)\)$')
+
+
+def _migrate_source_scores(c: sqlite3.Cursor) -> None:
+    """Move scores embedded as ``"Hacker News (score: 42)"`` into the ``score`` column."""
+    rows = c.execute("SELECT id, source FROM startups WHERE source GLOB '* (score: *)'").fetchall()
+    updates = []
+    for row_id, source in rows:
+        match = _EMBEDDED_SCORE.match(source)
+        if match:
+            updates.append((match.group(1), int(match.group(2)), row_id))
+    if updates:
+        c.executemany("UPDATE startups SET source = ?, score = ? WHERE id = ?", updates)
+        logger.info(
+            "db.migrate.source_scores",
+            extra={"event": "db.migrate.source_scores", "rows": len(updates)},
+        )
+
+
+def _backfill_change_seq(c: sqlite3.Cursor) -> None:
+    """Stamp rows written without the seq triggers and move the counter past them."""
+    c.execute('''
+        UPDATE startups SET change_seq = id + (SELECT seq FROM change_counter WHERE id = 1)
+        WHERE change_seq IS NULL
+    ''')
+    c.execute('''
+        UPDATE change_counter
+        SET seq = MAX(seq, (SELECT IFNULL(MAX(change_seq), 0) FROM startups))
+        WHERE id = 1
+    ''')
+
+
+def _migrate_scrape_log(c: sqlite3.Cursor) -> None:
+    """Carry the single row of the legacy ``scrape_log`` table into ``scrape_runs``."""
+    legacy = c.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'scrape_log'"
+    ).fetchone()
+    if not legacy:
+        return
+    c.execute('''
+        INSERT INTO scrape_runs (run_id, scraper, description, started_at, finished_at, success)
+        SELECT 'legacy-' || id, 'legacy', scrapers_run, last_scrape, last_scrape, 1
+        FROM scrape_log
+    ''')
+    c.execute('DROP TABLE scrape_log')
+    logger.info("db.migrate.scrape_log", extra={"event": "db.migrate.scrape_log"})
+
+
+SECONDS_PER_DAY = 86400
+# Bucket start for each trend granularity, as SQL over the rollup ``day`` column;
+# 1970-01-01 was a Thursday, so ``+ 3`` aligns weeks to Monday.
+TREND_GRANULARITIES = {
+    "day": "day",
+    "week": f"day - ((day / {SECONDS_PER_DAY} + 3) % 7) * {SECONDS_PER_DAY}",
+}
+# API dimension name -> rollup column
+TREND_DIMENSIONS = {"source": "source_key", "category": "category"}
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _source_key_sql(column: str) -> str:
+    """Render ``classify_source`` over ``column`` as a SQL CASE built from SOURCE_REGISTRY."""
+    branches = []
+    for key, entry in SOURCE_REGISTRY.items():
+        params = iter(entry["params"])
+        condition = re.sub(r"\bsource\b", column, entry["where"])
+        condition = re.sub(r"\?", lambda _: _sql_literal(next(params)), condition)
+        branches.append(f"WHEN {condition} THEN {_sql_literal(key)}")
+    return f"CASE {' '.join(branches)} ELSE 'other' END"
+
+
+def _rollup_triggers() -> Dict[str, str]:
+    """Trigger DDL keeping ``startup_daily_counts`` in step with ``startups``."""
+    def bucket(row: str) -> str:
+        return (
+            f"day = {row}.found_at - {row}.found_at % {SECONDS_PER_DAY} "
+            f"AND source_key = {_source_key_sql(row + '.source')} "
+            f"AND category = IFNULL({row}.category, '')"
+        )
+
+    add = f'''
+        INSERT INTO startup_daily_counts (day, source_key, category, count)
+        SELECT new.found_at - new.found_at % {SECONDS_PER_DAY}, {_source_key_sql('new.source')},
+               IFNULL(new.category, ''), 1
+        WHERE new.found_at IS NOT NULL
+        ON CONFLICT (day, source_key, category) DO UPDATE SET count = count + 1;'''
+    remove = f'''
+        UPDATE startup_daily_counts SET count = count - 1
+        WHERE old.found_at IS NOT NULL AND {bucket('old')};
+        DELETE FROM startup_daily_counts WHERE count <= 0 AND {bucket('old')};'''
+    return {
+        "startups_rollup_ai": f"CREATE TRIGGER startups_rollup_ai AFTER INSERT ON startups BEGIN{add}\nEND",
+        "startups_rollup_ad": f"CREATE TRIGGER startups_rollup_ad AFTER DELETE ON startups BEGIN{remove}\nEND",
+        "startups_rollup_au": (
+            "CREATE TRIGGER startups_rollup_au AFTER UPDATE OF found_at, source, category ON startups "
+            f"BEGIN{remove}{add}\nEND"
+        ),
+    }
+
+
+def _rebuild_daily_counts(c: sqlite3.Cursor) -> None:
+    """Recompute ``startup_daily_counts`` from ``startups`` in one grouped pass."""
+    c.execute("DELETE FROM startup_daily_counts")
+    c.execute(f'''
+        INSERT INTO startup_daily_counts (day, source_key, category, count)
+        SELECT found_at - found_at % {SECONDS_PER_DAY}, {_source_key_sql('source')}, IFNULL(category, ''), COUNT(*)
+        FROM startups WHERE found_at IS NOT NULL
+        GROUP BY 1, 2, 3
+    ''')
+    logger.info("db.rollup.rebuilt", extra={"event": "db.rollup.rebuilt"})
+
+
+def _install_daily_rollups(c: sqlite3.Cursor) -> None:
+    """Create the rollup table and triggers, rebuilding counts when either is new or changed.
+
+    The triggers embed the source registry as SQL, so editing SOURCE_REGISTRY
+    changes their text; that is detected here and the rollups are recomputed.
+    """
+    existing = dict(c.execute(
+        "SELECT name, sql FROM sqlite_master WHERE name = 'startup_daily_counts' OR name GLOB 'startups_rollup_*'"
+    ).fetchall())
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS startup_daily_counts (
+            day INTEGER NOT NULL,
+            source_key TEXT NOT NULL,
+            category TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, source_key, category)
+        ) WITHOUT ROWID
+    ''')
+    triggers = _rollup_triggers()
+    if "startup_daily_counts" in existing and all(existing.get(name) == sql for name, sql in triggers.items()):
+        return
+    for name, sql in triggers.items():
+        c.execute(f"DROP TRIGGER IF EXISTS {name}")
+        c.execute(sql)
+    _rebuild_daily_counts(c)
+
+
+# bm25() weights for the (name, description) columns: a hit in the name
+# outranks the same hit buried in a long description.
+FTS_RANK_WEIGHTS = (10.0, 1.0)
+# contentless_delete=1 tables arrived in SQLite 3.43.0
+_CONTENTLESS_DELETE_MIN_VERSION = (3, 43, 0)
+_FTS_TABLES = {
+    # External content: the index reads column values back from startups_search
+    "external": (
+        "CREATE VIRTUAL TABLE startups_fts "
+        "USING fts5(name, description, content='startups_search', content_rowid='id')"
+    ),
+    # Contentless: only the index is stored; rows are deleted by rowid
+    "contentless": (
+        "CREATE VIRTUAL TABLE startups_fts "
+        "USING fts5(name, description, content='', contentless_delete=1)"
+    ),
+}
+# Description expressions are placeholders: they read through zdecompress()
+# only once compressed rows can exist (see _install_search_index).
+_FTS_TRIGGERS = {
+    "external": '''
+        CREATE TRIGGER startups_ad AFTER DELETE ON startups BEGIN
+            INSERT INTO startups_fts(startups_fts, rowid, name, description) VALUES(
+                'delete', old.id, old.name,
+                (SELECT {stored} FROM startup_details WHERE startup_id = old.id)
+            );
+            DELETE FROM startup_details WHERE startup_id = old.id;
+        END;
+        CREATE TRIGGER startups_au AFTER UPDATE OF name ON startups BEGIN
+            INSERT INTO startups_fts(startups_fts, rowid, name, description) VALUES(
+                'delete', old.id, old.name,
+                (SELECT {stored} FROM startup_details WHERE startup_id = old.id)
+            );
+            INSERT INTO startups_fts(rowid, name, description) VALUES(
+                new.id, new.name,
+                (SELECT {stored} FROM startup_details WHERE startup_id = new.id)
+            );
+        END;
+        CREATE TRIGGER startup_details_au AFTER UPDATE OF description ON startup_details BEGIN
+            INSERT INTO startups_fts(startups_fts, rowid, name, description)
+            SELECT 'delete', id, name, {old} FROM startups WHERE id = old.startup_id;
+            INSERT INTO startups_fts(rowid, name, description)
+            SELECT id, name, {new} FROM startups WHERE id = new.startup_id;
+        END;
+    ''',
+    # No old values to replay: a delete by rowid is enough
+    "contentless": '''
+        CREATE TRIGGER startups_ad AFTER DELETE ON startups BEGIN
+            DELETE FROM startups_fts WHERE rowid = old.id;
+            DELETE FROM startup_details WHERE startup_id = old.id;
+        END;
+        CREATE TRIGGER startups_au AFTER UPDATE OF name ON startups BEGIN
+            DELETE FROM startups_fts WHERE rowid = old.id;
+            INSERT INTO startups_fts(rowid, name, description) VALUES(
+                new.id, new.name,
+                (SELECT {stored} FROM startup_details WHERE startup_id = new.id)
+            );
+        END;
+        CREATE TRIGGER startup_details_au AFTER UPDATE OF description ON startup_details BEGIN
+            DELETE FROM startups_fts WHERE rowid = old.startup_id;
+            INSERT INTO startups_fts(rowid, name, description)
+            SELECT id, name, {new} FROM startups WHERE id = new.startup_id;
+        END;
+    ''',
+}
+
+
+def fts_layout() -> str:
+    """Return the search index layout to use: ``"external"`` or ``"contentless"``.
+
+    ``DEVTOOLS_FTS_LAYOUT=contentless`` is honoured only when the linked SQLite
+    supports ``contentless_delete``; otherwise the external-content layout is kept.
+    External stays the default: on SQLite 3.51 the contentless index was no
+    smaller and inserted ~8% slower (benchmarks/fts_performance.json).
+    """
+    requested = os.getenv("DEVTOOLS_FTS_LAYOUT", "external").strip().lower()
+    if requested == "contentless" and sqlite3.sqlite_version_info >= _CONTENTLESS_DELETE_MIN_VERSION:
+        return "contentless"
+    if requested not in ("", "external"):
+        logger.warning(
+            "db.fts.layout_unsupported",
+            extra={"event": "db.fts.layout_unsupported", "requested": requested, "sqlite_version": sqlite3.sqlite_version},
+        )
+    return "external"
+
+
+def _install_search_index(c: sqlite3.Cursor) -> str:
+    """Create ``startups_fts``, its content view and triggers in the configured layout.
+
+    Switching layouts drops and refills the index. While descriptions are
+    stored compressed (or compressed rows remain) the view and triggers feed
+    FTS through ``zdecompress()``; otherwise they stay plain SQL so tools
+    without the function can still write to the tables. Returns the layout.
+    """
+    layout = fts_layout()
+    compressed = COMPRESS_DESCRIPTIONS or c.execute(
+        "SELECT 1 FROM startup_details WHERE typeof(description) = 'blob' LIMIT 1"
+    ).fetchone() is not None
+
+    def text(expr: str) -> str:
+        return f"zdecompress({expr})" if compressed else expr
+
+    c.execute("DROP VIEW IF EXISTS startups_search")
+    c.execute(f'''
+        CREATE VIEW startups_search AS
+        SELECT s.id AS id, s.name AS name, {text('d.description')} AS description
+        FROM startups s LEFT JOIN startup_details d ON d.startup_id = s.id
+    ''')
+    row = c.execute("SELECT sql FROM sqlite_master WHERE name = 'startups_fts'").fetchone()
+    existing = None if row is None else ("contentless" if "contentless_delete" in row[0] else "external")
+    if existing != layout:
+        c.execute("DROP TABLE IF EXISTS startups_fts")
+        c.execute(_FTS_TABLES[layout])
+        if layout == "contentless":
+            # 'rebuild' needs a content table, so fill the index directly
+            c.execute(
+                "INSERT INTO startups_fts(rowid, name, description) SELECT id, name, description FROM startups_search"
+            )
+        if existing is not None:
+            logger.info(
+                "db.migrate.fts_layout",
+                extra={"event": "db.migrate.fts_layout", "from": existing, "to": layout},
+            )
+    c.executescript(
+        "DROP TRIGGER IF EXISTS startups_ai; DROP TRIGGER IF EXISTS startups_ad; "
+        "DROP TRIGGER IF EXISTS startups_au; DROP TRIGGER IF EXISTS startup_details_au; "
+        "DROP TRIGGER IF EXISTS startup_details_ai;"
+        + _FTS_TRIGGERS[layout].format(
+            old=text("old.description"), new=text("new.description"), stored=text("description")
+        )
+        + f'''
+        CREATE TRIGGER startup_details_ai AFTER INSERT ON startup_details BEGIN
+            INSERT INTO startups_fts(rowid, name, description)
+            SELECT id, name, {text('new.description')} FROM startups WHERE id = new.startup_id;
+        END;
+        '''
+    )
+    weights = ", ".join(str(weight) for weight in FTS_RANK_WEIGHTS)
+    # Persisted in the index config, so every ORDER BY rank uses the weights
+    c.execute(f"INSERT INTO startups_fts(startups_fts, rank) VALUES('rank', 'bm25({weights})')")
+    return layout
+
+
+def _index_missing_fts_rows(c: sqlite3.Cursor) -> int:
+    """Add rows the contentless index never saw, e.g. after a crashed bulk load.
+
+    A contentless index cannot be rebuilt from a content table, so the rowids
+    missing from its ``docsize`` shadow table are inserted instead. Returns how
+    many rows were added.
+    """
+    c.execute(
+        "INSERT INTO startups_fts(rowid, name, description) "
+        "SELECT id, name, description FROM startups_search "
+        "WHERE id NOT IN (SELECT id FROM startups_fts_docsize)"
+    )
+    added = c.rowcount
+    if added:
+        logger.info("db.repair.fts", extra={"event": "db.repair.fts", "rows": added})
+    return added
+
+
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _new_file_incremental_vacuum(c: sqlite3.Cursor) -> None:
+    """Create a new, empty file with ``auto_vacuum=INCREMENTAL``.
+
+    The setting only takes effect before the first table exists, so this costs
+    nothing; an existing file is converted by ``run_maintenance`` instead,
+    because that needs a full VACUUM and app boot must stay fast.
+    """
+    row = c.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+    if row and not row[0]:
+        c.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+
+def _convert_to_incremental_vacuum(conn: sqlite3.Connection) -> bool:
+    """Rewrite an existing file to ``auto_vacuum=INCREMENTAL``; True when it ran.
+
+    A one-off VACUUM that copies the whole file, so it only runs from
+    maintenance and never inside a transaction.
+    """
+    auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if auto_vacuum == _AUTO_VACUUM_INCREMENTAL or conn.in_transaction:
+        return False
+    started = time.perf_counter()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    logger.info(
+        "db.migrate.auto_vacuum",
+        extra={
+            "event": "db.migrate.auto_vacuum",
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        },
+    )
+    return True
+
+
 def init_db() -> None:
     """Initialize the database schema, creating tables and indices if needed.
 
     Retries once on OperationalError to handle transient filesystem issues.
     """
+    if DB_READONLY:
+        # The schema arrives with each replicated snapshot
+        logger.info("db.init.skipped_readonly", extra={"event": "db.init.skipped_readonly", "db_path": str(DB_PATH)})
+        return
     logger.info("db.init.start", extra={"event": "db.init.start", "db_path": str(DB_PATH)})
     conn = None
     for attempt in range(2):
@@ -119,53 +667,137 @@ def init_db() -> None:
 
     try:
         c = conn.cursor()
+        _new_file_incremental_vacuum(c)
 
         c.execute('''
             CREATE TABLE IF NOT EXISTS startups (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL,
                 url TEXT UNIQUE,
-                description TEXT,
+                summary TEXT,
+                category TEXT,
                 source TEXT,
-                date_found TIMESTAMP
+                score INTEGER,
+                date_found TIMESTAMP,
+                found_at INTEGER
+            )
+        ''')
+        # date_found keeps the canonical ISO string for API consumers; found_at
+        # (UTC epoch seconds) is what ordering and range filters use.
+        _ensure_column(c, "startups", "found_at", "INTEGER")
+        # Full descriptions (HN post text, Product Hunt copy) live in a side
+        # table so list scans and counts read narrow rows; startups keeps a
+        # short summary and the [Category] tag for list views.
+        _ensure_column(c, "startups", "summary", "TEXT")
+        _ensure_column(c, "startups", "category", "TEXT")
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS startup_details (
+                startup_id INTEGER PRIMARY KEY REFERENCES startups(id),
+                description TEXT
             )
         ''')
+        _migrate_descriptions(c)
+        # Hacker News points used to be frozen into the source string at first
+        # sight; they now live in a numeric column the HN scraper refreshes.
+        if _ensure_column(c, "startups", "score", "INTEGER"):
+            _migrate_source_scores(c)
 
         # Add index on name for faster duplicate checking
         c.execute('CREATE INDEX IF NOT EXISTS idx_startups_name ON startups(name)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_startups_source ON startups(source)')
-
-        # Create table for tracking last scrape time
+        # Every listing orders by found_at; without these each page sorts the
+        # table (or every row of one source) in a temp B-tree. The composite index
+        # also covers source-only lookups.
+        c.execute('CREATE INDEX IF NOT EXISTS idx_startups_found_at ON startups(found_at)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_startups_source_found_at ON startups(source, found_at)')
+        # sort=score listings walk this backwards in (score DESC, id DESC) order.
+        # Only Hacker News rows carry a score, so the Hacker News score page
+        # finds its rows at the top of the index too.
+        c.execute('CREATE INDEX IF NOT EXISTS idx_startups_score ON startups(score)')
+        for legacy_index in ("idx_startups_source", "idx_startups_date_found", "idx_startups_source_date"):
+            c.execute(f'DROP INDEX IF EXISTS {legacy_index}')
+
+        # Append-only history of scraper runs; one row per scraper per run
         c.execute('''
-            CREATE TABLE IF NOT EXISTS scrape_log (
+            CREATE TABLE IF NOT EXISTS scrape_runs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                last_scrape TIMESTAMP NOT NULL,
-                scrapers_run TEXT
+                run_id TEXT NOT NULL,
+                scraper TEXT NOT NULL,
+                description TEXT,
+                started_at TIMESTAMP NOT NULL,
+                finished_at TIMESTAMP NOT NULL,
+                duration_ms REAL,
+                success INTEGER NOT NULL,
+                items_fetched INTEGER NOT NULL DEFAULT 0,
+                candidates_classified INTEGER NOT NULL DEFAULT 0,
+                llm_calls INTEGER NOT NULL DEFAULT 0,
+                cache_hits INTEGER NOT NULL DEFAULT 0,
+                inserted INTEGER NOT NULL DEFAULT 0,
+                errors INTEGER NOT NULL DEFAULT 0
             )
         ''')
-
-        # Create FTS index for fast search
+        # Partial index makes get_last_scrape_time() a single index probe
+        c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_scrape_runs_last_success
+            ON scrape_runs(finished_at) WHERE success = 1
+        ''')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_scrape_runs_scraper ON scrape_runs(scraper, id)')
+        _migrate_scrape_log(c)
+
+        # Create FTS index for fast search. The content table is a view joining
+        # the side table, so FTS rows are written when the details row lands.
+        layout = _install_search_index(c)
+        _backfill_found_at(c)
+
+        # Change feed: every insert or content update stamps the row with the
+        # next value of a single-row counter, so /api/changes is an index range
+        # read on change_seq rather than a rescan of the table.
+        _ensure_column(c, "startups", "change_seq", "INTEGER")
         c.execute('''
-            CREATE VIRTUAL TABLE IF NOT EXISTS startups_fts
-            USING fts5(name, description, content='startups', content_rowid='id')
+            CREATE TABLE IF NOT EXISTS change_counter (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                seq INTEGER NOT NULL
+            )
         ''')
+        c.execute('INSERT OR IGNORE INTO change_counter (id, seq) VALUES (1, 0)')
+        # When seq last moved, for HTTP Last-Modified; stamped by a trigger so
+        # every writer that bumps the generation keeps it current
+        _ensure_column(c, "change_counter", "changed_at", "REAL")
         c.executescript('''
-            CREATE TRIGGER IF NOT EXISTS startups_ai AFTER INSERT ON startups BEGIN
-                INSERT INTO startups_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+            CREATE TRIGGER IF NOT EXISTS change_counter_changed_at AFTER UPDATE OF seq ON change_counter
+            WHEN new.seq IS NOT old.seq BEGIN
+                UPDATE change_counter SET changed_at = (julianday('now') - 2440587.5) * 86400.0 WHERE id = new.id;
             END;
-            CREATE TRIGGER IF NOT EXISTS startups_ad AFTER DELETE ON startups BEGIN
-                INSERT INTO startups_fts(startups_fts, rowid, name, description) VALUES('delete', old.id, old.name, old.description);
+        ''')
+        _backfill_change_seq(c)
+        c.execute('CREATE INDEX IF NOT EXISTS idx_startups_change_seq ON startups(change_seq)')
+        c.executescript('''
+            CREATE TRIGGER IF NOT EXISTS startups_seq_ai AFTER INSERT ON startups BEGIN
+                UPDATE change_counter SET seq = seq + 1 WHERE id = 1;
+                UPDATE startups SET change_seq = (SELECT seq FROM change_counter WHERE id = 1) WHERE id = new.id;
             END;
-            CREATE TRIGGER IF NOT EXISTS startups_au AFTER UPDATE ON startups BEGIN
-                INSERT INTO startups_fts(startups_fts, rowid, name, description) VALUES('delete', old.id, old.name, old.description);
-                INSERT INTO startups_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+            DROP TRIGGER IF EXISTS startups_seq_au;
+            CREATE TRIGGER startups_seq_au
+            AFTER UPDATE OF name, url, summary, category, source, score, date_found, found_at ON startups BEGIN
+                UPDATE change_counter SET seq = seq + 1 WHERE id = 1;
+                UPDATE startups SET change_seq = (SELECT seq FROM change_counter WHERE id = 1) WHERE id = new.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS startup_details_seq_au
+            AFTER UPDATE OF description ON startup_details BEGIN
+                UPDATE change_counter SET seq = seq + 1 WHERE id = 1;
+                UPDATE startups SET change_seq = (SELECT seq FROM change_counter WHERE id = 1) WHERE id = new.startup_id;
             END;
         ''')
-        try:
-            c.execute("INSERT INTO startups_fts(startups_fts) VALUES('rebuild')")
-        except sqlite3.OperationalError:
-            # Rebuild may fail if table is empty or FTS not initialised yet; safe to ignore
-            pass
+        # Per day x source key x category counts, so trend queries read O(days)
+        # rollup rows instead of scanning startups.
+        _install_daily_rollups(c)
+        if layout == "external":
+            try:
+                c.execute("INSERT INTO startups_fts(startups_fts) VALUES('rebuild')")
+            except sqlite3.OperationalError:
+                # Rebuild may fail if table is empty or FTS not initialised yet; safe to ignore
+                pass
+        else:
+            _index_missing_fts_rows(c)
 
         conn.commit()
     finally:
@@ -217,17 +849,28 @@ def save_startup(startup: Dict[str, Any]) -> None:
     with _db_connection() as conn:
         c = conn.cursor()
         try:
+            found_at = to_epoch(startup['date_found'])
+            summary, category = summarize_description(startup['description'])
             c.execute('''
-                INSERT INTO startups (name, url, description, source, date_found)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO startups (name, url, summary, category, source, score, date_found, found_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 startup['name'],
                 startup['url'],
-                startup['description'],
+                summary,
+                category,
                 startup['source'],
-                startup['date_found']
+                startup.get('score'),
+                epoch_to_iso(found_at) if found_at is not None else startup['date_found'],
+                found_at,
             ))
+            # The details insert also feeds the FTS index (startup_details_ai)
+            c.execute(
+                'INSERT INTO startup_details (startup_id, description) VALUES (?, ?)',
+                (c.lastrowid, compress_description(startup['description'])),
+            )
             conn.commit()
+            scrape_metrics.increment("inserted")
             logger.info(
                 "db.startup_saved",
                 extra={
@@ -249,13 +892,131 @@ def save_startup(startup: Dict[str, Any]) -> None:
             )
 
 
+BULK_LOAD_BATCH = 5000
+
+
+def _bulk_row(record: Dict[str, Any]) -> Optional[tuple]:
+    """Shape one import record like ``save_startup`` would, or None when unusable."""
+    name, url = record.get("name"), record.get("url")
+    if not name or not url:
+        return None
+    date_found = record.get("date_found") or record.get("found_at")
+    found_at = to_epoch(date_found) if date_found not in (None, "") else None
+    score = record.get("score")
+    try:
+        score = int(score) if score not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+    summary, category = summarize_description(record.get("description"))
+    return (
+        name, url, summary, category, record.get("source"), score,
+        epoch_to_iso(found_at) if found_at is not None else date_found,
+        found_at, name, compress_description(record.get("description")),
+    )
+
+
+def bulk_load_startups(records: Iterable[Dict[str, Any]], batch_size: int = BULK_LOAD_BATCH) -> Dict[str, Any]:
+    """Insert a large backfill with the per-row triggers switched off.
+
+    Rows are deduplicated by name or URL like ``save_startup`` and written
+    with ``executemany`` in one transaction per ``batch_size`` rows. The FTS
+    index, change counter and daily rollups are then brought up to date for
+    the new rows in one pass each, and the triggers are put back. If the
+    process dies part way, ``init_db`` recreates the triggers and repairs the
+    derived tables on the next start. It rebuilds the external-content index,
+    and under the contentless layout it indexes the rowids the index is
+    missing. Records without a name or URL are skipped. Returns row counts
+    and throughput.
+    """
+    started = time.perf_counter()
+    read = inserted = invalid = 0
+    with _db_connection() as conn:
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -262144")
+        triggers = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name IN ('startups', 'startup_details')"
+        ).fetchall()
+        (first_new_id,) = conn.execute("SELECT IFNULL(MAX(id), 0) + 1 FROM startups").fetchone()
+        try:
+            with conn:
+                for name, _ in triggers:
+                    conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            batch: list[tuple] = []
+
+            def flush() -> int:
+                with conn:
+                    written = conn.executemany(
+                        '''
+                        INSERT OR IGNORE INTO startups
+                            (name, url, summary, category, source, score, date_found, found_at)
+                        SELECT ?, ?, ?, ?, ?, ?, ?, ?
+                        WHERE NOT EXISTS (SELECT 1 FROM startups WHERE name = ?)
+                        ''',
+                        [row[:9] for row in batch],
+                    ).rowcount
+                    # OR IGNORE: a repeated URL later in the file keeps the first description
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO startup_details (startup_id, description) "
+                        "SELECT id, ? FROM startups WHERE url = ? AND id >= ?",
+                        [(row[9], row[1], first_new_id) for row in batch],
+                    )
+                batch.clear()
+                return written
+
+            for record in records:
+                read += 1
+                row = _bulk_row(record)
+                if row is None:
+                    invalid += 1
+                    continue
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    inserted += flush()
+            if batch:
+                inserted += flush()
+        finally:
+            with conn:
+                conn.execute(
+                    "INSERT INTO startups_fts(rowid, name, description) "
+                    "SELECT id, name, description FROM startups_search WHERE id >= ?",
+                    (first_new_id,),
+                )
+                _backfill_change_seq(conn.cursor())
+                conn.execute(
+                    f'''
+                    INSERT INTO startup_daily_counts (day, source_key, category, count)
+                    SELECT found_at - found_at % {SECONDS_PER_DAY}, {_source_key_sql('source')},
+                           IFNULL(category, ''), COUNT(*)
+                    FROM startups WHERE id >= ? AND found_at IS NOT NULL
+                    GROUP BY 1, 2, 3
+                    ON CONFLICT (day, source_key, category) DO UPDATE SET count = count + excluded.count
+                    ''',
+                    (first_new_id,),
+                )
+                for _, sql in triggers:
+                    conn.execute(sql)
+    duration = time.perf_counter() - started
+    report = {
+        "rows_read": read,
+        "inserted": inserted,
+        "duplicates": read - inserted - invalid,
+        "invalid": invalid,
+        "duration_s": round(duration, 3),
+        "rows_per_second": round(read / duration, 1) if duration else None,
+    }
+    logger.info("db.bulk_load", extra={"event": "db.bulk_load", **report})
+    return report
+
+
 def get_startup_by_id(startup_id: int) -> Optional[Dict[str, Any]]:
     """Fetch a single startup by its primary key."""
     with _db_connection() as conn:
         row = conn.execute(
-            '''
-            SELECT id, name, url, description, source, date_found
-            FROM startups WHERE id = ?
+            f'''
+            SELECT {DETAIL_COLUMNS}
+            FROM {DETAIL_JOIN} WHERE s.id = ?
             ''',
             (startup_id,),
         ).fetchone()
@@ -283,10 +1044,10 @@ def get_related_startups(source: str, exclude_id: int, limit: int = 4) -> list[D
         params = [source]
 
     query = f'''
-        SELECT id, name, url, description, source, date_found
+        SELECT {STARTUP_COLUMNS}
         FROM startups
         WHERE ({where_clause}) AND id != ?
-        ORDER BY date_found DESC
+        ORDER BY found_at DESC, id DESC
         LIMIT ?
     '''
 
@@ -311,16 +1072,40 @@ def get_related_startups(source: str, exclude_id: int, limit: int = 4) -> list[D
 
 _ALLOWED_WHERE_CLAUSES = frozenset(entry["where"] for entry in SOURCE_REGISTRY.values())
 
+# Listing orders, each served by an index: idx_startups_found_at / idx_startups_source_found_at
+# for date, idx_startups_score for score. Unscored rows sort last.
+LISTING_SORTS = {
+    "date": "found_at DESC, id DESC",
+    "score": "score DESC, id DESC",
+}
+
 
-def get_startups_by_sources(where_clause: str, params: Iterable, limit: Optional[int] = None, offset: Optional[int] = None) -> list[Dict[str, Any]]:
+def _order_by(sort: str) -> str:
+    try:
+        return LISTING_SORTS[sort]
+    except KeyError:
+        raise ValueError(f"Unsupported sort: {sort!r}") from None
+
+
+def get_startups_by_sources(
+    where_clause: str,
+    params: Iterable,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    sort: str = "date",
+) -> list[Dict[str, Any]]:
     """Query startups matching a dynamic WHERE clause with optional pagination."""
     if where_clause not in _ALLOWED_WHERE_CLAUSES:
         raise ValueError(f"Disallowed where_clause: {where_clause!r}")
-    query = '''
-        SELECT id, name, url, description, source, date_found
-        FROM startups
-        WHERE {} ORDER BY date_found DESC
-    '''.format(where_clause)
+    # Left to itself the planner serves the two-prefix Hacker News clause from
+    # idx_startups_source_found_at and sorts every HN row by score; walking the
+    # score index instead stops after one page, since scored rows sit at its top.
+    indexed_by = "INDEXED BY idx_startups_score" if sort == "score" else ""
+    query = f'''
+        SELECT {STARTUP_COLUMNS}
+        FROM startups {indexed_by}
+        WHERE {where_clause} ORDER BY {_order_by(sort)}
+    '''
 
     args = list(params)
     query, args = _append_pagination(query, args, limit, offset)
@@ -333,6 +1118,7 @@ def get_startups_by_sources(where_clause: str, params: Iterable, limit: Optional
         extra={
             "event": "db.get_startups_by_sources",
             "where": where_clause,
+            "sort": sort,
             "limit": limit,
             "offset": offset,
             "returned": len(results),
@@ -359,18 +1145,24 @@ def count_startups_by_sources(where_clause: str, params: Iterable) -> int:
     return count
 
 
-def get_startups_by_source_key(source_key: str, limit: Optional[int] = None, offset: Optional[int] = None) -> list[Dict[str, Any]]:
+def get_startups_by_source_key(
+    source_key: str,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    sort: str = "date",
+) -> list[Dict[str, Any]]:
     """Fetch startups for a named source key (github, hackernews, producthunt) with pagination."""
     entry = SOURCE_REGISTRY.get(source_key)
     if entry:
-        results = get_startups_by_sources(entry["where"], entry["params"], limit, offset)
+        results = get_startups_by_sources(entry["where"], entry["params"], limit, offset, sort=sort)
     else:
-        results = get_all_startups(limit, offset)
+        results = get_all_startups(limit, offset, sort=sort)
     logger.debug(
         "db.get_startups_by_source_key",
         extra={
             "event": "db.get_startups_by_source_key",
             "source_key": source_key,
+            "sort": sort,
             "limit": limit,
             "offset": offset,
             "returned": len(results),
@@ -419,11 +1211,34 @@ def get_source_counts() -> Dict[str, int]:
     return summary
 
 
-def get_all_startups(limit: Optional[int] = None, offset: Optional[int] = None) -> list[Dict[str, Any]]:
-    """Fetch all startups ordered by date, with optional pagination."""
-    query = '''
-        SELECT id, name, url, description, source, date_found
-        FROM startups ORDER BY date_found DESC
+def get_all_startups(
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    sort: str = "date",
+    fields: Optional[Sequence[str]] = None,
+    desc_len: Optional[int] = None,
+) -> list[Dict[str, Any]]:
+    """Fetch all startups newest first (or highest score first), with optional pagination.
+
+    ``fields`` narrows the columns read (see ``API_FIELDS``); only a request
+    for ``description`` joins ``startup_details``, and then only for the rows
+    of the requested page, picked from the narrow table first.
+    """
+    order = _order_by(sort)
+    if fields is None:
+        select, source = STARTUP_COLUMNS, "startups"
+    else:
+        select, joined = _projection(fields, desc_len)
+        if joined:
+            # Pick the page from the narrow table, then hydrate just those rows
+            query, params = _append_pagination(f"SELECT id FROM startups ORDER BY {order}", [], limit, offset)
+            with _db_connection() as conn:
+                ids = [row[0] for row in conn.execute(query, params).fetchall()]
+            return get_startups_by_ids(ids, fields=fields, desc_len=desc_len)
+        source = "startups s"
+    query = f'''
+        SELECT {select}
+        FROM {source} ORDER BY {order}
     '''
     params: list = []
     query, params = _append_pagination(query, params, limit, offset)
@@ -436,6 +1251,7 @@ def get_all_startups(limit: Optional[int] = None, offset: Optional[int] = None)
         "db.get_all_startups",
         extra={
             "event": "db.get_all_startups",
+            "sort": sort,
             "limit": limit,
             "offset": offset,
             "returned": len(results),
@@ -444,6 +1260,65 @@ def get_all_startups(limit: Optional[int] = None, offset: Optional[int] = None)
     return results
 
 
+EXPORT_COLUMNS = ("id", "name", "url", "description", "source", "score", "date_found", "found_at")
+_EXPORT_SELECT = ", ".join(
+    f"{_DESCRIPTION_SELECT} AS description" if column == "description" else f"s.{column}"
+    for column in EXPORT_COLUMNS
+)
+
+
+def iter_startups(
+    source_key: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    batch_size: int = 1000,
+) -> Iterator[Dict[str, Any]]:
+    """Stream startups in id order, optionally filtered by source key and date range.
+
+    Rows are pulled from a single cursor with ``fetchmany`` so memory stays
+    constant regardless of table size. The connection stays open until the
+    generator is exhausted or closed.
+    """
+    clauses: list[str] = []
+    params: list = []
+    entry = SOURCE_REGISTRY.get(source_key) if source_key else None
+    if entry:
+        clauses.append(f"({entry['where']})")
+        params.extend(entry["params"])
+    if since:
+        clauses.append("found_at >= ?")
+        params.append(to_epoch(since))
+    if until:
+        clauses.append("found_at < ?")
+        params.append(to_epoch(until))
+
+    query = f"SELECT {_EXPORT_SELECT} FROM {DETAIL_JOIN}"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY s.id"
+
+    exported = 0
+    with _db_connection() as conn:
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            exported += len(rows)
+            for row in rows:
+                yield dict(row)
+    logger.debug(
+        "db.iter_startups",
+        extra={
+            "event": "db.iter_startups",
+            "source_key": source_key,
+            "since": since,
+            "until": until,
+            "returned": exported,
+        },
+    )
+
+
 def get_existing_startup_keys() -> list[Dict[str, str]]:
     """Return existing startup name/url pairs for fast duplicate pre-filtering."""
     with _db_connection() as conn:
@@ -457,6 +1332,174 @@ def get_existing_startup_keys() -> list[Dict[str, str]]:
     return results
 
 
+def get_changes_since(since: int, limit: int = 500) -> list[Dict[str, Any]]:
+    """Return startups inserted or updated after change sequence ``since``, oldest change first.
+
+    Each row carries its ``change_seq``; the last one is the cursor for the next poll.
+    """
+    with _db_connection() as conn:
+        rows = conn.execute(
+            f'''
+            SELECT {DETAIL_COLUMNS}, s.change_seq
+            FROM {DETAIL_JOIN} WHERE s.change_seq > ?
+            ORDER BY s.change_seq
+            LIMIT ?
+            ''',
+            (since, limit),
+        ).fetchall()
+    results = [dict(row) for row in rows]
+    logger.debug(
+        "db.get_changes_since",
+        extra={"event": "db.get_changes_since", "since": since, "limit": limit, "returned": len(results)},
+    )
+    return results
+
+
+def get_change_keys_since(since: int, limit: int = 1000) -> list[Dict[str, Any]]:
+    """Like ``get_changes_since`` but only ``id``, ``source``, ``found_at`` and ``change_seq``.
+
+    Reads the startups table alone, so walking every row costs no detail join or decompression.
+    """
+    with _db_connection() as conn:
+        rows = conn.execute(
+            '''
+            SELECT id, source, found_at, change_seq
+            FROM startups WHERE change_seq > ?
+            ORDER BY change_seq
+            LIMIT ?
+            ''',
+            (since, limit),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def bucket_start(epoch: int, granularity: str = "day") -> int:
+    """Return the start of the UTC day or Monday-aligned week containing ``epoch``."""
+    day = epoch - epoch % SECONDS_PER_DAY
+    if granularity == "week":
+        day -= ((day // SECONDS_PER_DAY + 3) % 7) * SECONDS_PER_DAY
+    return day
+
+
+def get_trends(
+    since: int,
+    until: int,
+    granularity: str = "day",
+    by: str = "source",
+    source_key: Optional[str] = None,
+    category: Optional[str] = None,
+) -> list[Dict[str, Any]]:
+    """Count startups found in ``[since, until)`` per time bucket and source key or category.
+
+    Reads the ``startup_daily_counts`` rollup, so cost grows with the number of
+    days in range, not the number of startups. ``since`` and ``until`` are
+    epoch seconds and are widened to whole days. Rows come back as
+    ``{"bucket", "key", "count"}`` ordered by bucket; empty buckets are omitted.
+    """
+    if granularity not in TREND_GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity!r}")
+    if by not in TREND_DIMENSIONS:
+        raise ValueError(f"Unsupported trend dimension: {by!r}")
+    dimension = TREND_DIMENSIONS[by]
+    clauses = ["day >= ?", "day < ?"]
+    params: list = [bucket_start(since), until]
+    if source_key:
+        clauses.append("source_key = ?")
+        params.append(source_key)
+    if category is not None:
+        clauses.append("category = ?")
+        params.append(category)
+    query = f'''
+        SELECT {TREND_GRANULARITIES[granularity]} AS bucket, {dimension} AS key, SUM(count) AS count
+        FROM startup_daily_counts
+        WHERE {" AND ".join(clauses)}
+        GROUP BY bucket, key
+        ORDER BY bucket, key
+    '''
+    with _db_connection() as conn:
+        rows = conn.execute(query, params).fetchall()
+    results = [dict(row) for row in rows]
+    logger.debug(
+        "db.get_trends",
+        extra={
+            "event": "db.get_trends",
+            "since": since,
+            "until": until,
+            "granularity": granularity,
+            "by": by,
+            "returned": len(results),
+        },
+    )
+    return results
+
+
+def get_change_generation() -> int:
+    """Return the current change sequence; it moves whenever any startup is inserted or updated."""
+    with _db_connection() as conn:
+        row = conn.execute('SELECT seq FROM change_counter WHERE id = 1').fetchone()
+    return row[0] if row else 0
+
+
+def get_generation_changed_at() -> Optional[str]:
+    """Return the ISO UTC time the change generation last moved, or None if it never has."""
+    with _db_connection() as conn:
+        row = conn.execute('SELECT changed_at FROM change_counter WHERE id = 1').fetchone()
+    if not row or row[0] is None:
+        return None
+    return datetime.fromtimestamp(row[0], timezone.utc).isoformat()
+
+
+def load_listing_columns() -> tuple[int, list[tuple]]:
+    """Read ``(id, found_at, source)`` for every startup with the generation they reflect.
+
+    Both reads share one transaction so the generation always matches the rows.
+    Inside ``shared_connection()`` they reuse its read transaction, which must
+    not be committed or rolled back from here.
+    """
+    with _db_connection() as conn:
+        owns_transaction = not conn.in_transaction
+        if owns_transaction:
+            conn.execute('BEGIN')
+        try:
+            generation = conn.execute('SELECT seq FROM change_counter WHERE id = 1').fetchone()
+            rows = conn.execute('SELECT id, found_at, source FROM startups').fetchall()
+        finally:
+            if owns_transaction:
+                conn.rollback()
+    logger.debug(
+        "db.load_listing_columns",
+        extra={"event": "db.load_listing_columns", "returned": len(rows)},
+    )
+    return (generation[0] if generation else 0), rows
+
+
+def get_startups_by_ids(
+    ids: Iterable[int], fields: Optional[Sequence[str]] = None, desc_len: Optional[int] = None
+) -> list[Dict[str, Any]]:
+    """Hydrate list rows for the given ids, preserving the order of ``ids``; missing ids are skipped."""
+    ids = [int(row_id) for row_id in ids]
+    if fields is None:
+        select, source = STARTUP_COLUMNS, "startups"
+    else:
+        # The id is always read to restore the order, and dropped again below
+        select, joined = _projection({"id", *fields}, desc_len)
+        source = DETAIL_JOIN if joined else "startups s"
+    by_id: Dict[int, Dict[str, Any]] = {}
+    with _db_connection() as conn:
+        # Stay well under SQLITE_MAX_VARIABLE_NUMBER on older builds
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = conn.execute(
+                f"SELECT {select} FROM {source} WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            by_id.update((row["id"], dict(row)) for row in rows)
+    if fields is not None and "id" not in fields:
+        for row in by_id.values():
+            del row["id"]
+    return [by_id[row_id] for row_id in ids if row_id in by_id]
+
+
 def count_all_startups() -> int:
     """Return the total number of startups in the database."""
     with _db_connection() as conn:
@@ -468,8 +1511,19 @@ def count_all_startups() -> int:
     return count
 
 
-def search_startups(query: str, limit: int = 20, offset: int = 0) -> list[Dict[str, Any]]:
-    """Search startups using FTS5 full-text search."""
+def search_startups(
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+    fields: Optional[Sequence[str]] = None,
+    desc_len: Optional[int] = None,
+) -> list[Dict[str, Any]]:
+    """Search startups using FTS5 full-text search.
+
+    The page of matches is ranked inside the FTS index first, so full
+    descriptions are joined only for the rows returned, and not at all when
+    ``fields`` leaves ``description`` out.
+    """
     if not query:
         return []
 
@@ -477,15 +1531,22 @@ def search_startups(query: str, limit: int = 20, offset: int = 0) -> list[Dict[s
     if not sanitized:
         return []
 
+    select, joined = _projection(API_FIELDS if fields is None else fields, desc_len)
+    details = "LEFT JOIN startup_details d ON d.startup_id = s.id" if joined else ""
     with _db_connection() as conn:
         rows = conn.execute(
-            '''
-            SELECT s.id, s.name, s.url, s.description, s.source, s.date_found
-            FROM startups s
-            JOIN startups_fts fts ON s.id = fts.rowid
-            WHERE startups_fts MATCH ?
-            ORDER BY rank
-            LIMIT ? OFFSET ?
+            f'''
+            WITH page AS (
+                SELECT rowid AS id, rank FROM startups_fts
+                WHERE startups_fts MATCH ?
+                ORDER BY rank
+                LIMIT ? OFFSET ?
+            )
+            SELECT {select}
+            FROM page
+            JOIN startups s ON s.id = page.id
+            {details}
+            ORDER BY page.rank
             ''',
             (sanitized, limit, offset),
         ).fetchall()
@@ -529,9 +1590,9 @@ def count_search_results(query: str) -> int:
 def get_startup_by_url(url: str) -> Optional[Dict[str, Any]]:
     """Fetch a single startup by its URL."""
     with _db_connection() as conn:
-        row = conn.execute('''
-            SELECT id, name, url, description, source, date_found
-            FROM startups WHERE url = ?
+        row = conn.execute(f'''
+            SELECT {DETAIL_COLUMNS}
+            FROM {DETAIL_JOIN} WHERE s.url = ?
         ''', (url,)).fetchone()
 
     result = dict(row) if row else None
@@ -542,32 +1603,103 @@ def get_startup_by_url(url: str) -> Optional[Dict[str, Any]]:
     return result
 
 
-def record_scrape_completion(scrapers_run: Optional[str] = None) -> None:
-    """Record that a scrape has completed, replacing any previous entry."""
+SCORE_REFRESH_BATCH = 400
+
+
+def refresh_scores(scores: Iterable[tuple[str, int]]) -> int:
+    """Update ``score`` for already-stored startups from ``(url, score)`` sightings.
+
+    One ``UPDATE ... FROM (VALUES ...)`` per batch; rows whose score is
+    unchanged are left alone so they do not re-enter the change feed. Only
+    Hacker News rows take a score: a URL first saved by another source keeps
+    its own ranking. Returns the number of rows updated.
+    """
+    latest = {url: int(score) for url, score in scores if url}
+    pairs = list(latest.items())
+    hackernews = SOURCE_REGISTRY["hackernews"]
+    updated = 0
     with _db_connection() as conn:
-        c = conn.cursor()
-        # Clear old entries and insert new one
-        c.execute('DELETE FROM scrape_log')
-        c.execute('''
-            INSERT INTO scrape_log (last_scrape, scrapers_run)
-            VALUES (?, ?)
-        ''', (datetime.now().isoformat(), scrapers_run))
-        conn.commit()
+        with conn:
+            for start in range(0, len(pairs), SCORE_REFRESH_BATCH):
+                batch = pairs[start:start + SCORE_REFRESH_BATCH]
+                cursor = conn.execute(
+                    f'''
+                    UPDATE startups SET score = sightings.column2
+                    FROM (VALUES {", ".join("(?, ?)" for _ in batch)}) AS sightings
+                    WHERE startups.url = sightings.column1 AND startups.score IS NOT sightings.column2
+                        AND ({hackernews["where"]})
+                    ''',
+                    [value for pair in batch for value in pair] + hackernews["params"],
+                )
+                updated += cursor.rowcount
     logger.info(
-        "db.scrape_log_updated",
+        "db.scores_refreshed",
+        extra={"event": "db.scores_refreshed", "sightings": len(pairs), "updated": updated},
+    )
+    return updated
+
+
+SCRAPE_RUN_COUNTERS = scrape_metrics.COUNTER_FIELDS
+
+
+def record_scrape_completion(runs: Iterable[Dict[str, Any]], run_id: Optional[str] = None) -> str:
+    """Append one ``scrape_runs`` row per scraper in a single transaction.
+
+    Each run dict carries ``scraper``, ``description``, ``started_at``,
+    ``finished_at`` (datetimes or ISO strings), ``success`` and the counters in
+    ``SCRAPE_RUN_COUNTERS``. Returns the run id shared by the rows.
+    """
+    run_id = run_id or str(uuid.uuid4())
+    rows = []
+    for run in runs:
+        started_at = run["started_at"]
+        finished_at = run["finished_at"]
+        duration_ms = None
+        if isinstance(started_at, datetime) and isinstance(finished_at, datetime):
+            duration_ms = round((finished_at - started_at).total_seconds() * 1000, 2)
+        rows.append((
+            run_id,
+            run["scraper"],
+            run.get("description"),
+            started_at.isoformat() if isinstance(started_at, datetime) else started_at,
+            finished_at.isoformat() if isinstance(finished_at, datetime) else finished_at,
+            run.get("duration_ms", duration_ms),
+            1 if run.get("success") else 0,
+            *(int(run.get(counter, 0)) for counter in SCRAPE_RUN_COUNTERS),
+        ))
+
+    with _db_connection() as conn:
+        with conn:
+            conn.executemany(
+                f'''
+                INSERT INTO scrape_runs (
+                    run_id, scraper, description, started_at, finished_at, duration_ms, success,
+                    {", ".join(SCRAPE_RUN_COUNTERS)}
+                ) VALUES ({", ".join("?" * (7 + len(SCRAPE_RUN_COUNTERS)))})
+                ''',
+                rows,
+            )
+            # A scrape that changed no rows still moves "Last Updated"; bump the
+            # generation so caches keyed on it refresh
+            conn.execute('UPDATE change_counter SET seq = seq + 1 WHERE id = 1')
+    logger.info(
+        "db.scrape_runs_recorded",
         extra={
-            "event": "db.scrape_log_updated",
-            "scrapers_run": scrapers_run,
+            "event": "db.scrape_runs_recorded",
+            "scrape_run_id": run_id,
+            "scrapers": [row[1] for row in rows],
+            "successful": sum(row[6] for row in rows),
         },
     )
+    return run_id
 
 
 def get_last_scrape_time() -> Optional[str]:
-    """Return the ISO timestamp of the most recent completed scrape."""
+    """Return the ISO timestamp of the most recent successful scraper run."""
     with _db_connection() as conn:
-        c = conn.cursor()
-        c.execute('SELECT last_scrape FROM scrape_log ORDER BY id DESC LIMIT 1')
-        row = c.fetchone()
+        row = conn.execute(
+            'SELECT MAX(finished_at) FROM scrape_runs WHERE success = 1'
+        ).fetchone()
 
     result = row[0] if row else None
     logger.debug(
@@ -575,3 +1707,87 @@ def get_last_scrape_time() -> Optional[str]:
         extra={"event": "db.get_last_scrape_time", "last_scrape": result},
     )
     return result
+
+
+def get_scrape_runs(limit: int = 50, scraper: Optional[str] = None) -> list[Dict[str, Any]]:
+    """Return the most recent scraper runs, newest first, optionally for one scraper."""
+    query = 'SELECT * FROM scrape_runs'
+    params: list = []
+    if scraper:
+        query += ' WHERE scraper = ?'
+        params.append(scraper)
+    query += ' ORDER BY id DESC LIMIT ?'
+    params.append(limit)
+
+    with _db_connection() as conn:
+        rows = conn.execute(query, params).fetchall()
+    results = [dict(row) for row in rows]
+    for row in results:
+        row["success"] = bool(row["success"])
+    logger.debug(
+        "db.get_scrape_runs",
+        extra={
+            "event": "db.get_scrape_runs",
+            "scraper": scraper,
+            "limit": limit,
+            "returned": len(results),
+        },
+    )
+    return results
+
+
+MAINTENANCE_VACUUM_PAGES = int(os.getenv("DEVTOOLS_MAINTENANCE_VACUUM_PAGES", "2000"))
+# Rows sampled per index by ANALYZE; keeps the pass bounded as the table grows
+MAINTENANCE_ANALYSIS_LIMIT = 1000
+# FTS5 leaf pages merged per run; trigger churn leaves many small segments
+MAINTENANCE_FTS_MERGE_PAGES = 500
+
+
+def _file_stats(conn: sqlite3.Connection) -> Dict[str, int]:
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {"freelist_pages": freelist, "file_bytes": page_count * page_size}
+
+
+def run_maintenance(max_vacuum_pages: Optional[int] = None) -> Dict[str, Any]:
+    """Reclaim free pages, refresh planner statistics and merge FTS segments.
+
+    Meant to run after each scrape. Every step is bounded: at most
+    ``max_vacuum_pages`` pages go back to the filesystem per call (default
+    ``DEVTOOLS_MAINTENANCE_VACUUM_PAGES``), ANALYZE samples under
+    ``analysis_limit`` and the FTS merge caps its work. The exception is
+    the first run on a file created before incremental vacuum, which VACUUMs
+    it once to switch the mode. Returns the freelist size and file size
+    before and after.
+    """
+    pages = MAINTENANCE_VACUUM_PAGES if max_vacuum_pages is None else max_vacuum_pages
+    started = time.perf_counter()
+    with _db_connection() as conn:
+        before = _file_stats(conn)
+        converted = _convert_to_incremental_vacuum(conn)
+        with conn:
+            conn.execute(
+                "INSERT INTO startups_fts(startups_fts, rank) VALUES('merge', ?)",
+                (MAINTENANCE_FTS_MERGE_PAGES,),
+            )
+        conn.execute(f"PRAGMA analysis_limit = {int(MAINTENANCE_ANALYSIS_LIMIT)}")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        if pages > 0:
+            # execute() steps the pragma once, freeing a single page; executescript
+            # runs it to completion
+            conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+        after = _file_stats(conn)
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    report = {
+        "freelist_pages_before": before["freelist_pages"],
+        "freelist_pages_after": after["freelist_pages"],
+        "file_bytes_before": before["file_bytes"],
+        "file_bytes_after": after["file_bytes"],
+        "incremental": auto_vacuum == _AUTO_VACUUM_INCREMENTAL,
+        "converted": converted,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    logger.info("db.maintenance", extra={"event": "db.maintenance", **report})
+    return report
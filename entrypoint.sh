@@ -35,13 +35,20 @@ APP_ENV="OPENAI_API_KEY=${OPENAI_API_KEY:-} PRODUCTHUNT_CLIENT_ID=${PRODUCTHUNT_
 # Datadog environment variables
 DD_ENV_VARS="DD_ENV=${DD_ENV:-prod} DD_SERVICE=${DD_SERVICE:-devtoolscrape} DD_VERSION=${DD_VERSION:-1.1} DD_AGENT_HOST=${DD_AGENT_HOST:-dd-agent} DD_TRACE_ENABLED=${DD_TRACE_ENABLED:-true} DD_APM_ENABLED=${DD_APM_ENABLED:-true} DD_RUNTIME_METRICS_ENABLED=${DD_RUNTIME_METRICS_ENABLED:-true} DD_DOGSTATSD_URL=${DD_DOGSTATSD_URL:-udp://dd-agent:8125} DD_APPSEC_ENABLED=${DD_APPSEC_ENABLED:-true} DD_IAST_ENABLED=${DD_IAST_ENABLED:-true} DD_IAST_REQUEST_SAMPLING=${DD_IAST_REQUEST_SAMPLING:-100} DD_LLMOBS_ENABLED=${DD_LLMOBS_ENABLED:-1} DD_LLMOBS_ML_APP=${DD_LLMOBS_ML_APP:-devtoolscrape} DD_CODE_ORIGIN_FOR_SPANS_ENABLED=${DD_CODE_ORIGIN_FOR_SPANS_ENABLED:-true} DD_EXCEPTION_REPLAY_ENABLED=${DD_EXCEPTION_REPLAY_ENABLED:-true}"
 
-CRON_ENV="${APP_ENV} ${DD_ENV_VARS}"
-echo "0 */4 * * * cd /app && env ${CRON_ENV} ${DDTRACE_BIN} ${PYTHON_BIN} scrape_all.py >> /var/log/cron.log 2>&1" > /etc/cron.d/scrape_all
-chmod 0644 /etc/cron.d/scrape_all
-crontab /etc/cron.d/scrape_all
-
-# Start cron in the background
-cron
+if [ "${DEVTOOLS_DB_READONLY:-}" = "1" ]; then
+    # Read-only replica: no scraping; follow the snapshots the scraper node publishes
+    # to DEVTOOLS_REPLICATION_DIR and serve them.
+    "$PYTHON_BIN" replication.py apply || echo "No replica snapshot applied yet"
+    "$PYTHON_BIN" replication.py apply --watch --interval "${DEVTOOLS_REPLICATION_INTERVAL:-60}" >> /var/log/replication.log 2>&1 &
+else
+    CRON_ENV="${APP_ENV} ${DD_ENV_VARS} DEVTOOLS_REPLICATION_DIR=${DEVTOOLS_REPLICATION_DIR:-} DEVTOOLS_STATIC_EXPORT=${DEVTOOLS_STATIC_EXPORT:-1} DEVTOOLS_STATIC_EXPORT_DIR=${DEVTOOLS_STATIC_EXPORT_DIR:-} DEVTOOLS_PUBLIC_URL=${DEVTOOLS_PUBLIC_URL:-https://devtoolscrape.com}"
+    echo "0 */4 * * * cd /app && env ${CRON_ENV} ${DDTRACE_BIN} ${PYTHON_BIN} scrape_all.py >> /var/log/cron.log 2>&1" > /etc/cron.d/scrape_all
+    chmod 0644 /etc/cron.d/scrape_all
+    crontab /etc/cron.d/scrape_all
+
+    # Start cron in the background
+    cron
+fi
 
 # Start gunicorn for the Flask app
 exec ddtrace-run gunicorn -c gunicorn.conf.py app_production:app